@@ -0,0 +1,334 @@
+import asyncio
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import discord
+from discord.ext import commands
+
+from backups import backup_job
+from data_transfer import FORMATS, TRANSFER_TABLES, export_table, import_table
+from databases import Database
+from log_sink import FENCE, MAX_MESSAGE_LENGTH
+from loop_monitor import loop_watchdog
+from maintenance import maintenance_job
+
+
+def code_block(title: str, lines: list[str]) -> str:
+    """
+    `lines` in a code block under `title`, within Discord's message limit.
+    The lines are ranked, so the ones that don't fit are dropped from the end.
+    """
+    content = f"{title}\n```\n"
+    for line in lines:
+        if len(content) + len(line) + 1 + len(FENCE) > MAX_MESSAGE_LENGTH:
+            break
+        content += line + "\n"
+    return content + FENCE
+
+
+class Admin(commands.Cog):
+    def __init__(self, bot: discord.Bot):
+        self.bot = bot
+
+    group = discord.SlashCommandGroup("admin", "Bot maintenance commands")
+
+    @group.command(description="Turn the database query log on or off ( admin only )")
+    async def querylog(
+        self,
+        ctx: discord.ApplicationContext,
+        enabled: bool,
+        sample_rate: discord.Option(
+            float,
+            "Fraction of the statements to log, between 0 and 1",
+            min_value=0.0,
+            max_value=1.0,
+            default=1.0,
+        ),
+        slow_ms: discord.Option(
+            float,
+            "Log statements slower than this many milliseconds",
+            min_value=0.0,
+            default=None,
+        ),
+    ):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        Database.query_log.set_echo(enabled, sample_rate)
+        if slow_ms is not None:
+            Database.query_log.slow_threshold_ms = slow_ms
+
+        await ctx.respond(
+            f"✅ Query log is now **{'on' if enabled else 'off'}**"
+            + (f", logging {sample_rate:.0%} of the statements" if enabled else "")
+            + f". Slow query threshold: {Database.query_log.slow_threshold_ms:g} ms.",
+            ephemeral=True,
+        )
+
+    @group.command(
+        description="Show the slowest database statements since startup ( admin only )"
+    )
+    async def slowqueries(
+        self,
+        ctx: discord.ApplicationContext,
+        count: discord.Option(
+            int, "How many statements to show", min_value=1, max_value=25, default=10
+        ),
+        sort: discord.Option(
+            str,
+            "Rank by total, max or p95 latency",
+            choices=["total", "max", "p95"],
+            default="total",
+        ),
+        reset: discord.Option(
+            bool, "Clear the statistics after showing them", default=False
+        ),
+    ):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        top = Database.query_log.top(count, by=sort)
+        if reset:
+            Database.query_log.reset()
+
+        if not top:
+            await ctx.respond("No statements recorded yet.", ephemeral=True)
+            return
+
+        lines = []
+        for statement, stats in top:
+            lines.append(
+                f"{stats.count:>6}x  total {stats.total:9.1f} ms  avg {stats.total / stats.count:7.2f}"
+                f"  p95 <{stats.percentile(0.95):g}  max {stats.max:8.2f}\n  {statement[:150]}"
+            )
+
+        await ctx.respond(
+            code_block(f"**Top statements by {sort}**", lines), ephemeral=True
+        )
+
+    @group.command(
+        description="Show the commands that blocked the event loop the longest ( admin only )"
+    )
+    async def blockers(
+        self,
+        ctx: discord.ApplicationContext,
+        count: discord.Option(
+            int, "How many entries to show", min_value=1, max_value=25, default=10
+        ),
+        reset: discord.Option(
+            bool, "Clear the statistics after showing them", default=False
+        ),
+    ):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        top = loop_watchdog.top(count)
+        if reset:
+            loop_watchdog.reset()
+
+        if not top:
+            await ctx.respond("The event loop hasn't been blocked yet.", ephemeral=True)
+            return
+
+        lines = []
+        for (command, coroutine), stats in top:
+            where = f"/{command} in {coroutine}" if command != "-" else coroutine
+            lines.append(
+                f"{stats.count:>6}x  total {stats.total:9.0f} ms  max {stats.max:7.0f} ms"
+                f"\n  {where}"
+            )
+
+        await ctx.respond(
+            code_block("**Event loop blockers**, stacks are in the bot log", lines),
+            ephemeral=True,
+        )
+
+    @group.command(description="Take a snapshot of every database now ( admin only )")
+    async def backup(self, ctx: discord.ApplicationContext):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        await ctx.defer(ephemeral=True)
+        try:
+            results = await backup_job.arun()
+        except Exception as e:
+            await ctx.respond(f"❌ Backup failed: {e}", ephemeral=True)
+            return
+
+        lines = [
+            f"`{path}`: {seconds:.2f}s, {size / 1024:.1f} KiB"
+            for path, seconds, size in results
+        ]
+        await ctx.respond("✅ Backup finished\n" + "\n".join(lines), ephemeral=True)
+
+    @group.command(
+        description="Vacuum, analyze and check every database now ( admin only )"
+    )
+    async def maintenance(self, ctx: discord.ApplicationContext):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        await ctx.defer(ephemeral=True)
+        try:
+            await maintenance_job.arun()
+        except Exception as e:
+            await ctx.respond(f"❌ Maintenance failed: {e}", ephemeral=True)
+            return
+
+        await ctx.respond(
+            "✅ Maintenance finished, see the db log channel for the report.",
+            ephemeral=True,
+        )
+
+    @group.command(description="Show recent database changes ( admin only )")
+    async def audit(
+        self,
+        ctx: discord.ApplicationContext,
+        table: discord.Option(
+            str,
+            "Only changes to this table",
+            choices=[
+                "games",
+                "contributors",
+                "game_contributors",
+                "asset_requests",
+                "tasks",
+                "events",
+            ],
+            default=None,
+        ),
+        row_id: discord.Option(int, "Only changes to this row", default=None),
+        user: discord.Option(discord.User, "Only changes made by", default=None),
+        days: discord.Option(
+            int, "How far back to look", min_value=1, max_value=365, default=30
+        ),
+        count: discord.Option(
+            int, "How many entries to show", min_value=1, max_value=50, default=20
+        ),
+    ):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        if row_id is not None and table is None:
+            await ctx.respond(
+                "❌ Row ids are only unique within a table, pick a `table` too.",
+                ephemeral=True,
+            )
+            return
+
+        entries = await Database.aget_audit_log(
+            table=table,
+            row_id=row_id,
+            actor=user.name if user else None,
+            since=int(time.time()) - days * 24 * 60 * 60,
+            limit=count,
+        )
+        if not entries:
+            await ctx.respond("No matching changes.", ephemeral=True)
+            return
+
+        lines = []
+        for entry in entries:
+            at = datetime.fromtimestamp(entry["at"], timezone.utc)
+            changes = json.loads(entry["changes"])
+            if entry["action"] == "update":
+                details = ", ".join(
+                    f"{field}: {old!r} -> {new!r}"
+                    for field, (old, new) in changes.items()
+                )
+            else:
+                details = ", ".join(
+                    f"{field}: {value!r}" for field, value in changes.items()
+                )
+
+            lines.append(
+                f"{at:%Y-%m-%d %H:%M} {entry['action']} {entry['table_name']}"
+                f"#{entry['row_id']} by {entry['actor'] or 'system'}\n  {details[:200]}"
+            )
+
+        await ctx.respond(
+            code_block(f"**Last {len(entries)} changes**", lines), ephemeral=True
+        )
+
+    @group.command(description="Download a table as JSON lines or CSV ( admin only )")
+    async def export(
+        self,
+        ctx: discord.ApplicationContext,
+        table: discord.Option(str, "Table to export", choices=list(TRANSFER_TABLES)),
+        format: discord.Option(
+            str, "File format", choices=list(FORMATS), default="jsonl"
+        ),
+    ):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        await ctx.defer(ephemeral=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, f"{table}.{format}.gz")
+            # reads on its own connection, no need to queue behind other queries
+            count, seconds = await asyncio.to_thread(export_table, table, path)
+            await ctx.respond(
+                f"✅ Exported {count} rows of `{table}` in {seconds:.2f}s ({count / max(seconds, 1e-9):.0f} rows/s)",
+                file=discord.File(path),
+                ephemeral=True,
+            )
+
+    @group.command(
+        name="import",
+        description="Upsert rows from a JSON lines or CSV file into a table ( admin only )",
+    )
+    async def import_(
+        self,
+        ctx: discord.ApplicationContext,
+        table: discord.Option(
+            str, "Table to import into", choices=list(TRANSFER_TABLES)
+        ),
+        file: discord.Option(
+            discord.Attachment, "A .jsonl or .csv file, optionally gzipped"
+        ),
+    ):
+        if not ctx.author.guild_permissions.manage_guild:
+            await ctx.respond(
+                "❌ You do not have permission to use this command.", ephemeral=True
+            )
+            return
+
+        await ctx.defer(ephemeral=True)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, os.path.basename(file.filename))
+            await file.save(path)
+            try:
+                count, seconds = await Database.arun(import_table, table, path)
+            except (ValueError, KeyError, sqlite3.Error) as e:
+                await ctx.respond(f"❌ Nothing was imported: {e}", ephemeral=True)
+                return
+
+        await ctx.respond(
+            f"✅ Imported {count} rows into `{table}` in {seconds:.2f}s ({count / max(seconds, 1e-9):.0f} rows/s)",
+            ephemeral=True,
+        )
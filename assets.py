@@ -1,17 +1,11 @@
-import os
-
 import discord
 from discord.ext import commands
-from dotenv import load_dotenv
 
+import config
 from databases import Database
 from game import Game
 from utils import Utils
 
-load_dotenv()
-GUILD_ID = int(os.getenv("GUILD_ID"))
-ANNOUNCE_CHANNEL_ID = int(os.getenv("ANNOUNCE_CHANNEL_ID", 0))
-
 
 class Assets(commands.Cog):
     ASSET_TYPES = ["2D Art", "3D Art", "SFX", "Music", "Voice", "Narrative", "UI"]
@@ -23,10 +17,10 @@ class Assets(commands.Cog):
 
     @group.command(description="Request an asset for your game from your game channel")
     async def request(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("⚠️ No game found for this channel.", ephemeral=True)
@@ -81,10 +75,11 @@ class AssetRequestModal(discord.ui.Modal):
         )
 
     async def callback(self, interaction: discord.Interaction):
+        Database.set_actor(interaction.user)
         content = self.children[0].value
         context = self.children[1].value
 
-        Database.add_asset_request(
+        await Database.aadd_asset_request(
             game_id=self.game_info["id"],
             asset_type=self.asset_type,
             content=content,
@@ -92,11 +87,12 @@ class AssetRequestModal(discord.ui.Modal):
             requested_by=str(interaction.user.name),
         )
 
-        assert ANNOUNCE_CHANNEL_ID > 0, (
+        announce_channel_id = config.get_int("ANNOUNCE_CHANNEL_ID")
+        assert announce_channel_id > 0, (
             "ANNOUNCE_CHANNEL_ID is not set in environment variables."
         )
 
-        channel = interaction.client.get_channel(ANNOUNCE_CHANNEL_ID)
+        channel = interaction.client.get_channel(announce_channel_id)
 
         msg = f"[{self.asset_type}] **{content}**\n"
         if context:
@@ -127,11 +123,11 @@ class AssetTypeSelect(discord.ui.Select):
         elif self.action == "list":
             asset_type = self.values[0]
             if self.user:
-                rows = Database.get_asset_requests_by_type(
+                rows = await Database.aget_asset_requests_with_games(
                     asset_type, "Accepted", self.user
                 )
             else:
-                rows = Database.get_asset_requests_by_type(asset_type)
+                rows = await Database.aget_asset_requests_with_games(asset_type)
 
             if not rows:
                 await interaction.response.send_message(
@@ -140,11 +136,9 @@ class AssetTypeSelect(discord.ui.Select):
                 return
 
             first = True
-            for req in rows:
-                request_id = req["id"]
+            for req, game_info in rows:
                 content = req["content"]
                 context = req["context"] or ""
-                channel_id = Database.get_game_channel(req["game_id"])
 
                 embed = discord.Embed(
                     title=f"{content}",
@@ -153,9 +147,9 @@ class AssetTypeSelect(discord.ui.Select):
                 )
 
                 if self.user:
-                    view = FinishView(req, Database.get_game_info(channel_id))
+                    view = FinishView(req, game_info)
                 else:
-                    view = RequestView(req, Database.get_game_info(channel_id))
+                    view = RequestView(req, game_info)
 
                 if first:
                     await interaction.response.send_message(
@@ -181,14 +175,16 @@ class AcceptButton(discord.ui.Button):
         self.game_info = game_info
 
     async def callback(self, interaction: discord.Interaction):
-        if not Database.is_request_pending(self.request):
+        Database.set_actor(interaction.user)
+        # only succeeds for whoever clicks first
+        if not await Database.amark_request_accepted(
+            self.request["id"], str(interaction.user.name)
+        ):
             await interaction.response.send_message(
                 "⚠️ This request has already been accepted", ephemeral=True
             )
             return
 
-        Database.mark_request_accepted(self.request["id"], str(interaction.user.name))
-
         channel = interaction.client.get_channel(Game.get_channel_id(self.game_info))
         await channel.send(
             f"👷 Asset request **{self.request['content']}** accepted by {interaction.user.mention}",
@@ -208,7 +204,12 @@ class FinishButton(discord.ui.Button):
         self.game_info = game_info
 
     async def callback(self, interaction: discord.Interaction):
-        Database.mark_request_finished(self.request["id"])
+        Database.set_actor(interaction.user)
+        if not await Database.amark_request_finished(self.request["id"]):
+            await interaction.response.send_message(
+                "⚠️ This request has already been finished", ephemeral=True
+            )
+            return
 
         channel = interaction.client.get_channel(Game.get_channel_id(self.game_info))
         await channel.send(
@@ -228,7 +229,7 @@ class RequestView(discord.ui.View):
             discord.ui.Button(
                 label=f"Go to {game_info['name']}",
                 style=discord.ButtonStyle.link,
-                url=f"https://discord.com/channels/{GUILD_ID}/{game_info['channel_id']}",
+                url=f"https://discord.com/channels/{config.get_int('GUILD_ID')}/{game_info['channel_id']}",
             )
         )
 
@@ -241,6 +242,6 @@ class FinishView(discord.ui.View):
             discord.ui.Button(
                 label=f"Go to {game_info['name']}",
                 style=discord.ButtonStyle.link,
-                url=f"https://discord.com/channels/{GUILD_ID}/{game_info['channel_id']}",
+                url=f"https://discord.com/channels/{config.get_int('GUILD_ID')}/{game_info['channel_id']}",
             )
         )
@@ -0,0 +1,54 @@
+import gzip
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+
+from databases import Database
+
+log = logging.getLogger("db.audit")
+
+ARCHIVE_DIR = "dbs/audit"
+
+
+def compact_audit_log(
+    max_age_days: int = 90, archive_dir: str = ARCHIVE_DIR
+) -> tuple[str | None, int]:
+    """
+    Move audit entries older than `max_age_days` into a gzip compressed JSON lines
+    archive and delete them from the table, in one transaction.
+    Returns the archive path (None when nothing was old enough) and the entry count.
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    cutoff = int(time.time()) - max_age_days * 24 * 60 * 60
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    archive_path = os.path.join(archive_dir, f"audit-{stamp}.jsonl.gz")
+
+    count = 0
+    with Database.connect(Database.GAMES_DB) as conn:
+        # nothing can be added to the range between archiving and deleting it
+        conn.execute("BEGIN IMMEDIATE")
+        cursor = conn.execute(
+            "SELECT * FROM audit_log WHERE at < ? ORDER BY id", (cutoff,)
+        )
+        col_names = [desc[0] for desc in cursor.description]
+
+        with gzip.open(archive_path + ".tmp", "wt", encoding="utf-8") as archive:
+            for row in cursor:
+                entry = dict(zip(col_names, row))
+                entry["changes"] = json.loads(entry["changes"])
+                archive.write(json.dumps(entry) + "\n")
+                count += 1
+
+        if count == 0:
+            conn.rollback()
+            os.remove(archive_path + ".tmp")
+            return None, 0
+
+        os.replace(archive_path + ".tmp", archive_path)
+        conn.execute("DELETE FROM audit_log WHERE at < ?", (cutoff,))
+        conn.commit()
+
+    log.info(f"Archived {count} audit entries to {archive_path}")
+    return archive_path, count
@@ -0,0 +1,159 @@
+import asyncio
+import gzip
+import logging
+import os
+import shutil
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+from databases import Database
+
+log = logging.getLogger("db.backup")
+
+BACKUP_DIR = "dbs/backups"
+PAGES_PER_STEP = 256  # copied per step, the source is only locked while a step runs
+STEP_SLEEP = 0.01  # seconds between steps, lets writers in
+# seconds after startup before an overdue backup runs, lets the bot finish connecting
+STARTUP_DELAY = 60
+
+
+def snapshot(db_path: str, backup_dir: str = BACKUP_DIR) -> tuple[str, float, int]:
+    """
+    Copy a live database into a gzip compressed snapshot.
+    Uses SQLite's online backup API on its own connection, so the bot keeps reading
+    and writing while the copy runs.
+    Returns the snapshot path, the time it took in seconds and its size in bytes.
+    """
+    os.makedirs(backup_dir, exist_ok=True)
+    start = time.perf_counter()
+
+    name = os.path.splitext(os.path.basename(db_path))[0]
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+    copy_path = os.path.join(backup_dir, f"{name}-{stamp}.db.tmp")
+    snapshot_path = os.path.join(backup_dir, f"{name}-{stamp}.db.gz")
+
+    source = sqlite3.connect(db_path)
+    target = sqlite3.connect(copy_path)
+    try:
+        source.backup(target, pages=PAGES_PER_STEP, sleep=STEP_SLEEP)
+    finally:
+        target.close()
+        source.close()
+
+    try:
+        with (
+            open(copy_path, "rb") as src,
+            gzip.open(snapshot_path + ".tmp", "wb") as dst,
+        ):
+            shutil.copyfileobj(src, dst)
+        os.replace(snapshot_path + ".tmp", snapshot_path)
+    finally:
+        os.remove(copy_path)
+
+    return snapshot_path, time.perf_counter() - start, os.path.getsize(snapshot_path)
+
+
+def prune(db_path: str, keep: int, backup_dir: str = BACKUP_DIR) -> list[str]:
+    """Delete all but the newest `keep` snapshots of a database, returns the deleted paths."""
+    name = os.path.splitext(os.path.basename(db_path))[0]
+    # timestamps sort chronologically, so the oldest come first
+    snapshots = sorted(
+        entry
+        for entry in os.listdir(backup_dir)
+        if entry.startswith(f"{name}-") and entry.endswith(".db.gz")
+    )
+
+    removed = []
+    for entry in snapshots[: max(len(snapshots) - keep, 0)]:
+        path = os.path.join(backup_dir, entry)
+        os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def newest_snapshot_time(backup_dir: str = BACKUP_DIR) -> float | None:
+    """Modification time of the newest snapshot of any database, None without any."""
+    try:
+        entries = os.listdir(backup_dir)
+    except FileNotFoundError:
+        return None
+    return max(
+        (
+            os.path.getmtime(os.path.join(backup_dir, entry))
+            for entry in entries
+            if entry.endswith(".db.gz")
+        ),
+        default=None,
+    )
+
+
+class BackupJob:
+    """
+    Snapshots every database file each `interval` seconds and keeps the newest
+    `keep` snapshots of each.
+    The schedule carries over restarts: the first backup is due `interval`
+    seconds after the newest snapshot, or right after startup without one.
+    Backups run on their own thread, never on the event loop or the database thread.
+    """
+
+    def __init__(
+        self,
+        interval: float = 6 * 60 * 60,
+        keep: int = 28,
+        backup_dir: str = BACKUP_DIR,
+    ):
+        self.interval = interval
+        self.keep = keep
+        self.backup_dir = backup_dir
+
+        self._task: asyncio.Task | None = None
+        self._running = asyncio.Lock()
+
+    def run(self) -> list[tuple[str, float, int]]:
+        """Snapshot and prune every database file, blocking."""
+        results = []
+        for db_path in Database.db_paths():
+            if not os.path.exists(db_path):
+                continue
+
+            path, seconds, size = snapshot(db_path, self.backup_dir)
+            log.info(f"Backed up {db_path} to {path} in {seconds:.2f}s ({size} bytes)")
+            results.append((path, seconds, size))
+
+            for removed in prune(db_path, self.keep, self.backup_dir):
+                log.info(f"Removed old snapshot {removed}")
+        return results
+
+    async def arun(self) -> list[tuple[str, float, int]]:
+        # one backup at a time, whether scheduled or asked for
+        async with self._running:
+            return await asyncio.to_thread(self.run)
+
+    def start(self):
+        """Start the periodic backups, must be called from the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="db-backups")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    def first_delay(self) -> float:
+        """Seconds until the first backup after startup."""
+        newest = newest_snapshot_time(self.backup_dir)
+        due = 0.0 if newest is None else newest + self.interval - time.time()
+        return max(due, STARTUP_DELAY)
+
+    async def _loop(self):
+        delay = self.first_delay()
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.interval
+            try:
+                await self.arun()
+            except Exception as e:
+                log.exception(f"Scheduled backup failed: {e}")
+
+
+backup_job = BackupJob()
@@ -0,0 +1,65 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from databases import Database
+from migrations import migrate
+
+
+def fetch_per_call(channel_id: int) -> dict | None:
+    """A game lookup the way it was done before the pool: its own connection each time."""
+    conn = sqlite3.connect(Database.GAMES_DB)
+    try:
+        cursor = conn.execute(
+            "SELECT * FROM games WHERE channel_id = ? LIMIT 1", (channel_id,)
+        )
+        row = cursor.fetchone()
+        col_names = [col[0] for col in cursor.description]
+    finally:
+        conn.close()
+    return dict(zip(col_names, row)) if row else None
+
+
+def fetch_pooled(channel_id: int) -> dict | None:
+    # not get_game_info, that answers from the game cache
+    return Database.fetch_one_as_dict(
+        Database.GAMES_DB, "games", "channel_id = ?", (channel_id,)
+    )
+
+
+def per_call_us(lookup, games: int, calls: int) -> float:
+    start = time.perf_counter()
+    for i in range(calls):
+        lookup(i % games)
+    return (time.perf_counter() - start) / calls * 1e6
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the pooled connection with a connection per lookup"
+    )
+    parser.add_argument("--games", type=int, default=500)
+    parser.add_argument("--calls", type=int, default=5000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        migrate()
+        with Database.connect(Database.GAMES_DB) as conn:
+            conn.executemany(
+                "INSERT INTO games (name, repo_name, channel_id, owner, owner_display_name) VALUES (?, ?, ?, ?, ?)",
+                (
+                    (f"Game {i}", f"game-{i}", i, "owner", "Owner")
+                    for i in range(args.games)
+                ),
+            )
+            conn.commit()
+
+        pooled = per_call_us(fetch_pooled, args.games, args.calls)
+        per_call = per_call_us(fetch_per_call, args.games, args.calls)
+        print(f"{args.calls} game lookups in a table of {args.games} games")
+        print(f"pooled:           {pooled:6.1f} us/call")
+        print(f"connect per call: {per_call:6.1f} us/call")
+        Database.close_all()
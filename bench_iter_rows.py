@@ -0,0 +1,73 @@
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+
+from databases import Database
+from migrations import migrate
+
+WHERE = "trust_points != 0"
+
+
+def measure(read) -> tuple[int, float, float]:
+    """Rows read, seconds and peak MB allocated while reading them."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    count = read()
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, seconds, peak / 1e6
+
+
+def fetch_all() -> int:
+    rows = Database.fetch_all_as_dict_arr(Database.GAMES_DB, "contributors", WHERE)
+    return sum(1 for _ in rows)
+
+
+def iter_rows() -> int:
+    rows = Database.iter_rows(Database.GAMES_DB, "contributors", where=WHERE)
+    return sum(1 for _ in rows)
+
+
+def iter_rows_projected() -> int:
+    rows = Database.iter_rows(
+        Database.GAMES_DB,
+        "contributors",
+        columns=("discord_username", "trust_points", "trust_remarks"),
+        where=WHERE,
+    )
+    return sum(1 for _ in rows)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare reading a whole table at once with iter_rows"
+    )
+    parser.add_argument("--contributors", type=int, default=100_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        migrate()
+        with Database.connect(Database.GAMES_DB) as conn:
+            conn.executemany(
+                "INSERT INTO contributors (discord_username, credit_name, trust_points, trust_remarks) VALUES (?, ?, ?, ?)",
+                (
+                    (f"user{i}", f"Credit Name {i}", i % 5, "some remark text here")
+                    for i in range(args.contributors)
+                ),
+            )
+            conn.commit()
+
+        print(f"{args.contributors} contributors, reading those with {WHERE}")
+        print(f"{'':<22} {'rows':>7} {'ms':>7} {'peak MB':>8}")
+        for name, read in (
+            ("fetch_all_as_dict_arr", fetch_all),
+            ("iter_rows", iter_rows),
+            ("iter_rows, 3 columns", iter_rows_projected),
+        ):
+            count, seconds, peak = measure(read)
+            print(f"{name:<22} {count:>7} {seconds * 1000:>7.0f} {peak:>8.2f}")
+        Database.close_all()
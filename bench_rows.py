@@ -0,0 +1,81 @@
+import argparse
+import time
+import tracemalloc
+
+from rows import ContributorRow, row_factory
+
+COLUMNS = ContributorRow.__match_args__
+# what /contributors viewalltrustpoints reads
+PROJECTION = ("id", "discord_username", "trust_points", "trust_remarks")
+
+
+def synthetic_rows(count: int) -> list[tuple]:
+    """Raw sqlite tuples shaped like the contributors table."""
+    return [
+        (i, f"user{i}", None, f"Credit Name {i}", None, None, None, i % 5, "remark")
+        for i in range(count)
+    ]
+
+
+def measure(make, raw: list[tuple], repeat: int) -> tuple[float, float, float]:
+    """Best build and item access time in milliseconds, and retained MB of the rows."""
+    build = access = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        rows = [make(row) for row in raw]
+        build = min(build, time.perf_counter() - start)
+
+        start = time.perf_counter()
+        sum(row["trust_points"] for row in rows)
+        access = min(access, time.perf_counter() - start)
+        del rows
+
+    tracemalloc.start()
+    rows = [make(row) for row in raw]
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return build * 1000, access * 1000, retained / 1e6
+
+
+def measure_attribute(make, raw: list[tuple], repeat: int) -> float:
+    """Best attribute access time in milliseconds."""
+    rows = [make(row) for row in raw]
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        sum(row.trust_points for row in rows)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare per-row dicts with the typed rows of rows.py"
+    )
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5, help="best of this many runs")
+    args = parser.parse_args()
+
+    raw = synthetic_rows(args.rows)
+    projected = [(row[0], row[1], row[7], row[8]) for row in raw]
+    paths = {
+        "dict": (lambda row: dict(zip(COLUMNS, row)), raw),
+        "typed": (row_factory(COLUMNS), raw),
+        "dict, 4 columns": (lambda row: dict(zip(PROJECTION, row)), projected),
+        "typed, 4 columns": (row_factory(PROJECTION), projected),
+    }
+
+    print(f"{args.rows} contributor rows, best of {args.repeat}")
+    print(f"{'':<18} {'build ms':>9} {'row[] ms':>9} {'.attr ms':>9} {'MB':>7}")
+    for name, (make, rows) in paths.items():
+        build, access, retained = measure(make, rows, args.repeat)
+        # dicts have no attribute access
+        attribute = (
+            f"{measure_attribute(make, rows, args.repeat):.1f}"
+            if not name.startswith("dict")
+            else "-"
+        )
+        print(
+            f"{name:<18} {build:>9.1f} {access:>9.1f} {attribute:>9} {retained:>7.1f}"
+        )
@@ -0,0 +1,89 @@
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from databases import Database
+from migrations import migrate
+
+TOPICS = "forest castle dragon knight pixel sword shadow river ocean tower magic robot space neon desert ghost".split()
+
+
+def populate(asset_requests: int, games: int, contributors: int, vocabulary: int):
+    rng = random.Random(1)
+    words = TOPICS + [f"w{i}x" for i in range(vocabulary)]
+
+    def text(count: int) -> str:
+        return " ".join(rng.choices(words, k=count))
+
+    with Database.connect(Database.GAMES_DB) as conn:
+        conn.executemany(
+            "INSERT INTO asset_requests (game_id, asset_type, content, context, requested_by, status) VALUES (1, '2D', ?, ?, 'someone', 'Pending')",
+            ((f"{text(4)} item{i}", text(25)) for i in range(asset_requests)),
+        )
+        conn.executemany(
+            "INSERT INTO games (name, repo_name, channel_id, owner, owner_display_name, description) VALUES (?, ?, ?, 'owner', 'Owner', ?)",
+            ((f"Game {i} {text(1)}", f"game-{i}", i, text(40)) for i in range(games)),
+        )
+        conn.executemany(
+            "INSERT INTO contributors (discord_username, credit_name) VALUES (?, ?)",
+            ((f"user{i}", f"{text(1).title()} Maker {i}") for i in range(contributors)),
+        )
+        # something to find that only one row has
+        conn.execute(
+            "UPDATE games SET description = 'a haunted lighthouse' WHERE id = 5"
+        )
+        conn.commit()
+
+
+def like_scan(term: str, limit: int = 10) -> list[tuple]:
+    """The same tables searched without the index, unranked."""
+    with Database.connect(Database.GAMES_DB) as conn:
+        return conn.execute(
+            """
+            SELECT 'asset request', id, content FROM asset_requests WHERE content LIKE ?1 OR context LIKE ?1
+            UNION ALL SELECT 'game', id, name FROM games WHERE name LIKE ?1 OR description LIKE ?1
+            UNION ALL SELECT 'contributor', id, credit_name FROM contributors WHERE credit_name LIKE ?1 OR discord_username LIKE ?1
+            LIMIT ?2
+        """,
+            (f"%{term}%", limit),
+        ).fetchall()
+
+
+def ms_per_query(search, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        search()
+    return (time.perf_counter() - start) / runs * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare /search's full-text index with a LIKE '%...%' scan"
+    )
+    parser.add_argument("terms", nargs="*")
+    parser.add_argument("--asset-requests", type=int, default=20_000)
+    parser.add_argument("--games", type=int, default=3000)
+    parser.add_argument("--contributors", type=int, default=5000)
+    parser.add_argument(
+        "--vocabulary",
+        type=int,
+        default=3000,
+        help="distinct words in the texts, fewer words match more rows",
+    )
+    parser.add_argument("--runs", type=int, default=100)
+    args = parser.parse_args()
+    terms = args.terms or ["lighthous", "item1234", "castle dragon", "w12x", "w12x w7x"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        migrate()
+        populate(args.asset_requests, args.games, args.contributors, args.vocabulary)
+
+        print(f"{'term':<16} {'fts ms':>7} {'like ms':>8}")
+        for term in terms:
+            fts = ms_per_query(lambda: Database.search(term), args.runs)
+            like = ms_per_query(lambda: like_scan(term), args.runs)
+            print(f"{term:<16} {fts:>7.2f} {like:>8.2f}")
+        Database.close_all()
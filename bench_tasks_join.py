@@ -0,0 +1,100 @@
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+from databases import Database
+from migrations import TABLES, migrate
+
+
+def create_legacy_files(tasks: int, events: int, users: int):
+    """tasks.db and events.db the way they were before games.db held them."""
+    os.makedirs("dbs", exist_ok=True)
+    with sqlite3.connect(Database.LEGACY_EVENTS_DB) as conn:
+        conn.execute(f"CREATE TABLE events ({TABLES['events']})")
+        conn.executemany(
+            "INSERT INTO events (id, name, triggered) VALUES (?, ?, ?)",
+            ((i, f"event {i}", i % 2) for i in range(1, events + 1)),
+        )
+    with sqlite3.connect(Database.LEGACY_TASKS_DB) as conn:
+        conn.execute(f"CREATE TABLE tasks ({TABLES['tasks']})")
+        conn.executemany(
+            "INSERT INTO tasks (user_id, description, deadline, event_id) VALUES (?, ?, ?, ?)",
+            (
+                (
+                    str(i % users),
+                    f"task {i}",
+                    f"2026-01-{i % 28 + 1:02}",
+                    # a third of the tasks don't wait on an event
+                    i % events + 1 if i % 3 else None,
+                )
+                for i in range(tasks)
+            ),
+        )
+
+
+def two_files(tasks: sqlite3.Connection, events: sqlite3.Connection):
+    """The tasks of a user as they had to be read from the separate files."""
+
+    def get_tasks_for_user(user_id) -> list[tuple]:
+        triggered = [
+            row[0]
+            for row in events.execute("SELECT id FROM events WHERE triggered = 1")
+        ]
+        placeholders = ", ".join("?" * len(triggered))
+        return tasks.execute(
+            f"""
+            SELECT id, description, deadline, finished FROM tasks
+            WHERE user_id = ? AND (event_id IS NULL OR event_id IN ({placeholders}))
+            ORDER BY deadline
+        """,
+            (user_id, *triggered),
+        ).fetchall()
+
+    return get_tasks_for_user
+
+
+def ms_per_query(get_tasks_for_user, users: int, queries: int) -> float:
+    start = time.perf_counter()
+    for i in range(queries):
+        get_tasks_for_user(str(i % users))
+    return (time.perf_counter() - start) / queries * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the tasks query on the old separate files with the join in games.db"
+    )
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--events", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=500)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        create_legacy_files(args.tasks, args.events, args.users)
+
+        start = time.perf_counter()
+        # copies the old files into games.db
+        migrate()
+        print(
+            f"Migrated {args.tasks} tasks and {args.events} events in {time.perf_counter() - start:.2f}s"
+        )
+
+        tasks = sqlite3.connect(Database.LEGACY_TASKS_DB)
+        events = sqlite3.connect(Database.LEGACY_EVENTS_DB)
+        old = two_files(tasks, events)
+        # same rows, the order of tasks with the same deadline may differ
+        for user_id in map(str, range(args.users)):
+            assert sorted(old(user_id)) == sorted(Database.get_tasks_for_user(user_id))
+
+        two_files_ms = ms_per_query(old, args.users, args.queries)
+        joined_ms = ms_per_query(Database.get_tasks_for_user, args.users, args.queries)
+        print(f"two files: {two_files_ms:.2f} ms/query")
+        print(f"joined:    {joined_ms:.2f} ms/query")
+
+        tasks.close()
+        events.close()
+        Database.close_all()
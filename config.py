@@ -0,0 +1,41 @@
+import os
+
+from utils import Utils
+
+# Test server ids, added to .env when missing so a fresh checkout talks to the test server
+DEFAULTS = {
+    "QA_CHANNEL_ID": "1416625126136483890",
+    "SCHEDULE_CHANNEL_ID": "1416666323831885905",
+    "CONTRIBUTORS_REQUEST_CHANNEL_ID": "1414479400250114058",
+    "REPORT_CHANNEL_ID": "1434093367385522267",
+    "SFX_REQUEST_CHANNEL_ID": "1461288656169074751",
+}
+
+_loaded = False
+
+
+def load():
+    """
+    Fill in the missing defaults in .env and load it into the environment.
+    Runs once, on the first config lookup or explicitly at startup, never on import.
+    """
+    global _loaded
+    if _loaded:
+        return
+
+    from dotenv import load_dotenv
+
+    for key, value in DEFAULTS.items():
+        Utils.ensure_env_var(key, value)
+    load_dotenv()
+    _loaded = True
+
+
+def get(key: str, default: str | None = None) -> str | None:
+    load()
+    return os.getenv(key, default)
+
+
+def get_int(key: str, default: int = 0) -> int:
+    value = get(key)
+    return int(value) if value else default
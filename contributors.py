@@ -1,4 +1,3 @@
-import os
 from collections import defaultdict
 from enum import IntEnum
 
@@ -6,6 +5,7 @@ import discord
 from discord.ext import commands
 from discord.ui import InputText, Modal
 
+import config
 from databases import Database
 from game import Game, GameState
 from utils import Utils
@@ -31,7 +31,7 @@ CONTRIBUTION_TYPES = [
     "QA",
     "UI/UX Designer",
     "Game Designer",
-    "Project Lead"
+    "Project Lead",
 ]
 
 PING_ROLES = {
@@ -69,12 +69,6 @@ TIMEZONE_ROLES = [
 
 TRUST_REWARD_ROLES = ["Original100"]
 
-Utils.ensure_env_var(
-    "CONTRIBUTORS_REQUEST_CHANNEL_ID", 1414479400250114058
-)  # Test Server
-
-CONTRIBUTOR_REQUEST_CHANNEL = int(os.getenv("CONTRIBUTORS_REQUEST_CHANNEL_ID", 0))
-
 
 class Contributors(commands.Cog):
     def __init__(self, bot: discord.Bot):
@@ -94,10 +88,10 @@ class Contributors(commands.Cog):
 
     @group.command(description="Add a contributor to your game from your game channel")
     async def add(self, ctx: discord.ApplicationContext, member: discord.Member):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("⚠️ No game found for this channel.", ephemeral=True)
@@ -112,12 +106,7 @@ class Contributors(commands.Cog):
             )
             return
 
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(member.name),),
-        )
+        contributor = await Database.aget_contributor(str(member.name))
 
         if not contributor:
             await ctx.channel.send(
@@ -147,10 +136,10 @@ class Contributors(commands.Cog):
 
     @group.command(description="Remove a contributor from this game")
     async def remove(self, ctx: discord.ApplicationContext, user_name: str):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("⚠️ No game found for this channel.", ephemeral=True)
@@ -162,12 +151,7 @@ class Contributors(commands.Cog):
             )
             return
 
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(user_name),),
-        )
+        contributor = await Database.aget_contributor(str(user_name))
 
         if not contributor:
             await ctx.respond(
@@ -177,7 +161,7 @@ class Contributors(commands.Cog):
             return
 
         # Remove contributor from game_contributors table
-        Database.delete_from_db(
+        await Database.adelete_from_db(
             Database.GAMES_DB,
             "game_contributors",
             "game_id = ? AND contributor_id = ?",
@@ -191,21 +175,16 @@ class Contributors(commands.Cog):
 
     @group.command(description="Export the list of contributors for the credits")
     async def export(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("⚠️ No game found for this channel.", ephemeral=True)
             return
 
-        owner_credit_name = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (game_info["owner"],),
-        )
+        owner_credit_name = await Database.aget_contributor(game_info["owner"])
 
         if not owner_credit_name:
             await ctx.respond(
@@ -213,7 +192,7 @@ class Contributors(commands.Cog):
             )
             return
 
-        contributors = Game.fetch_contributors(game_info, "credit_name")
+        contributors = await Game.fetch_contributors(game_info, "credit_name")
 
         if not contributors:
             await ctx.respond("⚠️ No contributors found for this game.", ephemeral=True)
@@ -245,10 +224,10 @@ class Contributors(commands.Cog):
 
     @group.command(description="Request a contributor in a specific role for your game")
     async def request(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("⚠️ No game found for this channel.", ephemeral=True)
@@ -272,12 +251,7 @@ class Contributors(commands.Cog):
 
     @group.command(description="View your contributor profile information")
     async def view(self, ctx: discord.ApplicationContext):
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(ctx.author.name),),
-        )
+        contributor = await Database.aget_contributor(str(ctx.author.name))
 
         if not contributor:
             await ctx.respond(
@@ -307,12 +281,7 @@ class Contributors(commands.Cog):
 
     @group.command(description="Update your credit name in your contributor profile")
     async def updatecreditname(self, ctx: discord.ApplicationContext, name: str):
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(ctx.author.name),),
-        )
+        contributor = await Database.aget_contributor(str(ctx.author.name))
 
         if not contributor:
             await ctx.respond(
@@ -321,7 +290,7 @@ class Contributors(commands.Cog):
             )
             return
 
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB,
             "contributors",
             contributor["id"],
@@ -333,12 +302,7 @@ class Contributors(commands.Cog):
 
     @group.command(description="Update your itch.io link in your contributor profile")
     async def updateitchiolink(self, ctx: discord.ApplicationContext, link: str):
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(ctx.author.name),),
-        )
+        contributor = await Database.aget_contributor(str(ctx.author.name))
 
         if not contributor:
             await ctx.respond(
@@ -350,7 +314,7 @@ class Contributors(commands.Cog):
         if not link.startswith("https://") and not link.startswith("http://"):
             link = "https://" + link
 
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB,
             "contributors",
             contributor["id"],
@@ -362,12 +326,7 @@ class Contributors(commands.Cog):
 
     @group.command(description="Update the time zone in your contributor profile")
     async def updatetimezone(self, ctx: discord.ApplicationContext, time_zone: int):
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(ctx.author.name),),
-        )
+        contributor = await Database.aget_contributor(str(ctx.author.name))
 
         if not contributor:
             await ctx.respond(
@@ -378,7 +337,7 @@ class Contributors(commands.Cog):
 
         time_zone = max(-12, min(14, time_zone))
 
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB,
             "contributors",
             contributor["id"],
@@ -416,12 +375,7 @@ class Contributors(commands.Cog):
 
     @group.command(description="View the time zone of a contributor")
     async def timezone(self, ctx: discord.ApplicationContext, user: discord.User):
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(user.name),),
-        )
+        contributor = await Database.aget_contributor(str(user.name))
 
         if not contributor:
             await ctx.respond(
@@ -476,7 +430,7 @@ class Contributors(commands.Cog):
 
     @group.command(description="Check the estimated trust level of a user")
     async def trustlevel(self, ctx: discord.ApplicationContext, user: discord.User):
-        trust_level = Contributors.calculate_trust(user)
+        trust_level = await Contributors.calculate_trust(user)
         await ctx.respond(
             f"✅ {user.display_name}'s estimated trust level is: **{TrustLevel(trust_level).name.replace('_', ' ').title()}**",
             ephemeral=True,
@@ -494,14 +448,9 @@ class Contributors(commands.Cog):
             await ctx.respond("❌ You do not have permission to use this command.")
             return
 
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(user.name),),
-        )
+        contributor = await Database.aget_contributor(str(user.name))
         if not contributor:
-            Database.register_contributor(
+            await Database.aregister_contributor(
                 discord_username=str(user.name),
                 discord_display_name=user.display_name,
                 credit_name=f"?{user.display_name}",
@@ -510,27 +459,14 @@ class Contributors(commands.Cog):
                 time_zone=None,
             )
 
-            contributor = Database.fetch_one_as_dict(
-                Database.GAMES_DB,
-                "contributors",
-                "discord_username = ?",
-                (str(user.name),),
-            )
+            contributor = await Database.aget_contributor(str(user.name))
 
-        Database.update_field(
+        await Database.aupdate_fields(
             Database.GAMES_DB,
             "contributors",
             contributor["id"],
-            "trust_points",
-            points,
-        )
-
-        Database.update_field(
-            Database.GAMES_DB,
-            "contributors",
-            contributor["id"],
-            "trust_remarks",
-            remarks,
+            trust_points=points,
+            trust_remarks=remarks,
         )
         await ctx.respond(
             f"✅ {user.display_name}'s Trust Points have been set to {points}.",
@@ -545,12 +481,7 @@ class Contributors(commands.Cog):
             await ctx.respond("❌ You do not have permission to use this command.")
             return
 
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (str(user.name),),
-        )
+        contributor = await Database.aget_contributor(str(user.name))
         if not contributor:
             await ctx.respond(
                 "⚠️ This user is not registered as a contributor.",
@@ -574,42 +505,45 @@ class Contributors(commands.Cog):
 
         await ctx.defer(ephemeral=True)
 
-        # fetch all contributors with trust points != 0
-        contributors = Database.fetch_all_as_dict_arr(
+        # stream all contributors with trust points != 0
+        contributors = Database.aiter_rows(
             Database.GAMES_DB,
             "contributors",
-            "trust_points != 0",
-            (),
+            columns=("discord_username", "trust_points", "trust_remarks"),
+            where="trust_points != 0",
         )
-        if not contributors:
-            # use follow up to send message after defer
-            await ctx.followup.send(
-                "⚠️ No contributors found.",
-                ephemeral=True,
-            )
-            return
 
-        response = "✅ List of all Trust Points:\n"
-        for contributor in contributors:
+        lines = []
+        async for contributor in contributors:
             # user = await ctx.bot.fetch_user(contributor["discord_username"])
-            trust_points = contributor.get("trust_points", 0)
-            trust_remarks = contributor.get("trust_remarks", "")
-            member = ctx.guild.get_member_named(contributor["discord_username"])
+            trust_points = contributor.trust_points
+            trust_remarks = contributor.trust_remarks
+            member = ctx.guild.get_member_named(contributor.discord_username)
             if member:
                 display_name = (
                     member.display_name
                 )  # Server nickname or global display name
             else:
-                display_name = f"{contributor['discord_username']} (left)"
-            response += (
+                display_name = f"{contributor.discord_username} (left)"
+            lines.append(
                 f"**{display_name}**:  {trust_points} points , *{trust_remarks}*\n"
             )
 
+        if not lines:
+            # use follow up to send message after defer
+            await ctx.followup.send(
+                "⚠️ No contributors found.",
+                ephemeral=True,
+            )
+            return
+
+        response = "✅ List of all Trust Points:\n" + "".join(lines)
+
         # use follow up to send message after defer
         await ctx.followup.send(response, ephemeral=True)
 
     @staticmethod
-    def calculate_trust(user: discord.User) -> int:
+    async def calculate_trust(user: discord.User) -> int:
         print(f"Calculating trust for user: {user.name}")
 
         # admins have maximum trust
@@ -629,19 +563,17 @@ class Contributors(commands.Cog):
         print(f"Trust score after roles: {trust_score}")
 
         # fetch all released games this user has contributed to
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB, "contributors", "discord_username = ?", (str(user.name),)
-        )
+        contributor = await Database.aget_contributor(str(user.name))
         if not contributor:
             return 0
 
         # +1 for each released or KEEP_DEVELOPING game contributed to
-        contributed_games = Database.fetch_all_as_dict_arr(
+        contributed_games = await Database.afetch_all_as_dict_arr(
             Database.GAMES_DB,
             "game_contributors gc JOIN games g ON gc.game_id = g.id",
             "gc.contributor_id = ? AND g.state IN (?, ?)",
             (
-                str(contributor["id"]),
+                str(contributor.id),
                 GameState.RELEASED.value,
                 GameState.KEEP_DEVELOPING.value,
             ),
@@ -654,7 +586,7 @@ class Contributors(commands.Cog):
         trust_score = min(trust_score, 2)
 
         # add contributor trust points from the database
-        trust_points = contributor.get("trust_points", 0)
+        trust_points = contributor.trust_points or 0
         trust_score += trust_points
 
         print(f"Trust score after trust points: {trust_score}")
@@ -716,9 +648,8 @@ class ContributorRegisterModal(Modal):
         self.add_item(self.time_zone)
 
     async def callback(self, interaction: discord.Interaction):
-        if Database.entry_exists(
-            Database.GAMES_DB, "contributors", "discord_username", self.discord_username
-        ):
+        Database.set_actor(interaction.user)
+        if await Database.aget_contributor(self.discord_username):
             await interaction.response.send_message(
                 "⚠️ You are already registered as a Contributor.", ephemeral=True
             )
@@ -727,7 +658,7 @@ class ContributorRegisterModal(Modal):
         time_zone = max(-12, min(14, int(self.time_zone.value)))
 
         # Insert new contributor
-        Database.register_contributor(
+        await Database.aregister_contributor(
             discord_username=self.discord_username,
             discord_display_name=self.discord_display_name,
             credit_name=self.credit_name.value,
@@ -762,11 +693,14 @@ class ContributionRoleSelect(discord.ui.Select):
         )
 
     async def callback(self, interaction: discord.Interaction):
+        Database.set_actor(interaction.user)
         chosen_role = self.values[0]
 
         if self.contributor_id == -1:
             # Requesting a contributor
-            channel = interaction.guild.get_channel(CONTRIBUTOR_REQUEST_CHANNEL)
+            channel = interaction.guild.get_channel(
+                config.get_int("CONTRIBUTORS_REQUEST_CHANNEL_ID")
+            )
             if not channel:
                 await interaction.response.send_message(
                     "⚠️ Contributor request channel not found. Please contact an admin.",
@@ -804,14 +738,14 @@ class ContributionRoleSelect(discord.ui.Select):
 
             await interaction.response.send_message(
                 f"✅ Requested contributor role: **{self.values[0]}**\n"
-                f"The request has been posted in <#{CONTRIBUTOR_REQUEST_CHANNEL}> you can mark it as done ✅ once you found someone."
+                f"The request has been posted in <#{config.get_int('CONTRIBUTORS_REQUEST_CHANNEL_ID')}> you can mark it as done ✅ once you found someone."
                 "\nA thread has been created in that channel as well for you to post more details about your request.",
                 ephemeral=True,
             )
             return
 
         # Insert link into relation table
-        Database.insert_into_db(
+        await Database.ainsert_into_db(
             Database.GAMES_DB,
             "game_contributors",
             game_id=self.game_info["id"],
@@ -819,7 +753,7 @@ class ContributionRoleSelect(discord.ui.Select):
             role=chosen_role,
         )
 
-        contributor = Database.fetch_one_as_dict(
+        contributor = await Database.afetch_one_as_dict(
             Database.GAMES_DB, "contributors", "id = ?", (self.contributor_id,)
         )
 
@@ -0,0 +1,209 @@
+import argparse
+import csv
+import gzip
+import json
+import logging
+import os
+import sqlite3
+import time
+from itertools import islice
+
+from databases import Database
+from migrations import migrate
+
+log = logging.getLogger("db.transfer")
+
+# tables that can be moved between servers -> the columns identifying a row
+TRANSFER_TABLES = {
+    "games": ("id",),
+    "contributors": ("id",),
+    "game_contributors": ("game_id", "contributor_id", "role"),
+    "asset_requests": ("id",),
+}
+FORMATS = ("jsonl", "csv")
+CHUNK_SIZE = 1000
+# CSV has no null, NULL is written as \N (like PostgreSQL's COPY) so that
+# empty strings, e.g. the repo_name of games without a repo, stay empty strings
+CSV_NULL = "\\N"
+# written by the running bot, which keeps the tables cached
+BOT_PID_PATH = "dbs/bot.pid"
+
+
+def detect_format(path: str) -> str:
+    name = path.removesuffix(".gz")
+    for fmt in FORMATS:
+        if name.endswith(f".{fmt}"):
+            return fmt
+    raise ValueError(f"Can't tell the format of {path}, use .jsonl or .csv")
+
+
+def open_text(path: str, mode: str):
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8", newline="")
+    return open(path, mode, encoding="utf-8", newline="")
+
+
+def table_columns(conn: sqlite3.Connection, table: str) -> list[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def export_table(table: str, path: str) -> tuple[int, float]:
+    """
+    Stream every row of `table` into a JSON lines or CSV file, optionally gzipped.
+    Reads from its own connection in one read transaction, so the export is a
+    consistent snapshot and the bot keeps writing meanwhile.
+    Returns the row count and the time it took in seconds.
+    """
+    if table not in TRANSFER_TABLES:
+        raise ValueError(f"Table {table} can't be exported")
+    fmt = detect_format(path)
+    start = time.perf_counter()
+
+    count = 0
+    conn = sqlite3.connect(Database.GAMES_DB)
+    try:
+        cursor = conn.execute(f"SELECT * FROM {table} ORDER BY rowid")
+        columns = [desc[0] for desc in cursor.description]
+
+        with open_text(path, "w") as file:
+            if fmt == "csv":
+                writer = csv.writer(file)
+                writer.writerow(columns)
+
+            while rows := cursor.fetchmany(CHUNK_SIZE):
+                if fmt == "csv":
+                    writer.writerows(
+                        [CSV_NULL if value is None else value for value in row]
+                        for row in rows
+                    )
+                else:
+                    file.writelines(
+                        json.dumps(dict(zip(columns, row))) + "\n" for row in rows
+                    )
+                count += len(rows)
+    finally:
+        conn.close()
+
+    seconds = time.perf_counter() - start
+    log.info(
+        f"Exported {count} rows of {table} to {path} in {seconds:.2f}s ({count / max(seconds, 1e-9):.0f} rows/s)"
+    )
+    return count, seconds
+
+
+def read_records(path: str, fmt: str):
+    """Yield the rows of a JSON lines or CSV file as dicts, one line at a time."""
+    with open_text(path, "r") as file:
+        if fmt == "csv":
+            for record in csv.DictReader(file):
+                yield {
+                    key: None if value == CSV_NULL else value
+                    for key, value in record.items()
+                }
+        else:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def import_table(table: str, path: str) -> tuple[int, float]:
+    """
+    Upsert the rows of a JSON lines or CSV file into `table`: rows whose key already
+    exists are updated, the others inserted.
+    The whole file goes in as one transaction, in batches of CHUNK_SIZE rows, so
+    memory stays flat however large the file is and a bad row imports nothing.
+    Returns the row count and the time it took in seconds.
+    """
+    if table not in TRANSFER_TABLES:
+        raise ValueError(f"Table {table} can't be imported")
+    fmt = detect_format(path)
+    keys = TRANSFER_TABLES[table]
+    start = time.perf_counter()
+
+    count = 0
+    records = read_records(path, fmt)
+    with Database.connect(Database.GAMES_DB) as conn:
+        known_columns = table_columns(conn, table)
+        conn.execute("BEGIN IMMEDIATE")
+
+        while chunk := list(islice(records, CHUNK_SIZE)):
+            # rows of a batch can have different columns, insert each shape separately
+            shapes: dict[tuple, list[tuple]] = {}
+            for record in chunk:
+                shapes.setdefault(tuple(record), []).append(tuple(record.values()))
+
+            for columns, values in shapes.items():
+                unknown = set(columns) - set(known_columns)
+                if unknown:
+                    raise ValueError(f"Unknown columns for {table}: {sorted(unknown)}")
+
+                updates = ", ".join(
+                    f"{column} = excluded.{column}"
+                    for column in columns
+                    if column not in keys
+                )
+                conn.executemany(
+                    f"INSERT INTO {table} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join('?' * len(columns))}) "
+                    f"ON CONFLICT ({', '.join(keys)}) "
+                    + (f"DO UPDATE SET {updates}" if updates else "DO NOTHING"),
+                    values,
+                )
+            count += len(chunk)
+
+        Database._audit(conn, table, "import", [(None, {"rows": count, "file": path})])
+        conn.commit()
+
+    # the imported rows bypassed the write-through caches
+    Database.games.clear()
+    Database.contributors.clear()
+    Database.warm_caches()
+
+    seconds = time.perf_counter() - start
+    Database._log(
+        f"**Imported {count} rows into `{table}`** from `{path}` in {seconds:.2f}s ({count / max(seconds, 1e-9):.0f} rows/s)"
+    )
+    return count, seconds
+
+
+def bot_pid() -> int | None:
+    """The pid of the bot process using the databases, None when it isn't running."""
+    try:
+        with open(BOT_PID_PATH) as file:
+            pid = int(file.read())
+    except (OSError, ValueError):
+        return None
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        # left behind by a bot that crashed
+        return None
+    except PermissionError:
+        pass
+    return pid
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Move bot data between databases as JSON lines or CSV (.gz to compress)"
+    )
+    parser.add_argument("action", choices=["export", "import"])
+    parser.add_argument("table", choices=list(TRANSFER_TABLES))
+    parser.add_argument("path")
+    args = parser.parse_args()
+
+    # the bot's caches treat a miss as "doesn't exist", rows imported behind
+    # its back would stay invisible until a restart
+    if args.action == "import" and (pid := bot_pid()) is not None:
+        parser.error(
+            f"The bot is running (pid {pid}), stop it first or use /admin import"
+        )
+
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    # a fresh database gets its tables first, e.g. when seeding a new server
+    migrate()
+    if args.action == "export":
+        export_table(args.table, args.path)
+    else:
+        import_table(args.table, args.path)
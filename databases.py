@@ -1,43 +1,212 @@
 import asyncio
-import os
+import contextvars
+import functools
+import json
+import logging
+import re
 import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 import discord
 
+import metrics
+from db_cache import ContributorCache, GameCache
+from log_sink import LogSink
+from query_log import QueryLog
+from rows import row_factory
 from utils import Utils
 
+log = logging.getLogger("db")
+
 
 class Database:
     bot: discord.Bot | None = None
     TEST_CHANNEL_TO_PRINT_DB_LOGS = 1417887751080116234
     REAL_CHANNEL_TO_PRINT_DB_LOGS = 1417887126695182397
     GAMES_DB = "dbs/games.db"
-    TASKS_DB = "dbs/tasks.db"
-    EVENTS_DB = "dbs/events.db"
+    # tasks and events are tables in games.db, so they can be joined with everything else
+    TASKS_DB = GAMES_DB
+    EVENTS_DB = GAMES_DB
+    # the separate files they used to live in, imported by the migrations
+    LEGACY_TASKS_DB = "dbs/tasks.db"
+    LEGACY_EVENTS_DB = "dbs/events.db"
+
+    # pragmas applied once when a pooled connection is opened
+    CONNECTION_PRAGMAS = {
+        # readers no longer wait behind writers, the mode is stored in the file
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",  # with WAL only checkpoints need to fsync
+        "wal_autocheckpoint": 1000,  # pages, the default, named so it's on record
+        # truncate the WAL back after checkpoints
+        "journal_size_limit": 64 * 1024 * 1024,
+        "busy_timeout": 5000,
+        "cache_size": -8000,  # negative = KiB, so ~8 MB page cache
+        "temp_store": "MEMORY",
+    }
+
+    # one long-lived connection per database file, guarded by its own lock
+    _connections: dict[str, sqlite3.Connection] = {}
+    _connection_locks: dict[str, threading.RLock] = {}
+    _pool_lock = threading.Lock()
+
+    # every awaitable query runs on this single thread, so they complete in
+    # submission order and never block the event loop
+    _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="database")
+
+    # games by channel and id, kept coherent by the write helpers below
+    games = GameCache()
+    # contributor profiles by discord username, bounded and expiring
+    contributors = ContributorCache()
+
+    # posts db change logs to the log channel in batches
+    log_sink = LogSink(lambda: Database._get_log_channel())
+
+    # who is changing the database, recorded in audit_log; set per command or component callback
+    actor: contextvars.ContextVar[str | None] = contextvars.ContextVar(
+        "db_actor", default=None
+    )
+
+    # statement timings, slow query log and echo, see /admin querylog and /admin slowqueries
+    query_log = QueryLog()
 
     @classmethod
     def init(cls, bot: discord.Bot):
         cls.bot = bot
+        # echo and explain every statement while testing, never by default in production
+        cls.query_log.set_echo(Utils.is_test_environment())
+        cls.query_log.explain = Utils.is_test_environment()
+
+    @classmethod
+    @contextmanager
+    def connect(cls, db_path: str):
+        """
+        Borrow the shared connection for `db_path`, opening it on first use.
+        The connection stays locked to the calling thread until the block exits.
+        """
+        with cls._pool_lock:
+            lock = cls._connection_locks.setdefault(db_path, threading.RLock())
+
+        with lock:
+            conn = cls._connections.get(db_path)
+            if conn is None:
+                conn = sqlite3.connect(db_path, check_same_thread=False)
+                for pragma, value in cls.CONNECTION_PRAGMAS.items():
+                    conn.execute(f"PRAGMA {pragma} = {value}")
+                cls._connections[db_path] = conn
+
+            try:
+                yield conn
+            except BaseException:
+                # never leave a half finished transaction on the shared connection
+                if conn.in_transaction:
+                    conn.rollback()
+                raise
+
+    @classmethod
+    def db_paths(cls) -> list[str]:
+        # several names may point at the same file, list each file once
+        return list(dict.fromkeys((cls.GAMES_DB, cls.TASKS_DB, cls.EVENTS_DB)))
+
+    @classmethod
+    def close_all(cls):
+        cls._executor.shutdown(wait=True)
+
+        with cls._pool_lock:
+            for db_path, conn in list(cls._connections.items()):
+                with cls._connection_locks[db_path]:
+                    conn.close()
+            cls._connections.clear()
+
+    @classmethod
+    def _get_log_channel(cls):
+        if cls.bot is None:
+            return None
+
+        return (
+            cls.bot.get_channel(cls.TEST_CHANNEL_TO_PRINT_DB_LOGS)
+            if Utils.is_test_environment()
+            else cls.bot.get_channel(cls.REAL_CHANNEL_TO_PRINT_DB_LOGS)
+        )
 
     @classmethod
     def _log(cls, message: str):
-        try:
-            if cls.bot is None:
-                print(f"{message}")
-                return
+        log.info(message)
 
-            channel = (
-                cls.bot.get_channel(cls.TEST_CHANNEL_TO_PRINT_DB_LOGS)
-                if Utils.is_test_environment()
-                else cls.bot.get_channel(cls.REAL_CHANNEL_TO_PRINT_DB_LOGS)
-            )
+        # batched and posted to the db log channel by the sink's background task
+        if cls.bot is not None and not cls.log_sink.submit(message):
+            log.warning("Db log queue is full, the message above won't be posted")
+
+    @classmethod
+    def set_actor(cls, user: discord.abc.User | None):
+        cls.actor.set(user.name if user is not None else None)
+
+    @classmethod
+    def _audit(
+        cls,
+        conn: sqlite3.Connection,
+        table: str,
+        action: str,
+        changes: list[tuple[int | None, dict]],
+    ):
+        """Record (row id, changed columns) pairs in audit_log, inside the caller's transaction."""
+        if table == "audit_log" or not changes:
+            return
+
+        at = int(time.time())
+        actor = cls.actor.get()
+        conn.executemany(
+            "INSERT INTO audit_log (at, table_name, row_id, action, changes, actor) VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                (at, table, row_id, action, json.dumps(columns, default=str), actor)
+                for row_id, columns in changes
+            ),
+        )
 
-            if channel:
-                asyncio.run_coroutine_threadsafe(channel.send(message), cls.bot.loop)
+    @classmethod
+    def _query(
+        cls, conn: sqlite3.Connection, query: str, params: tuple = ()
+    ) -> tuple[list[tuple], tuple[str, ...]]:
+        """Execute one statement and fetch its rows and column names, timing it for the query log."""
+        if cls.query_log.explain:
+            cls.query_log.check_plan(conn, query, params)
+
+        start = time.perf_counter()
+        cursor = conn.execute(query, params)
+        rows = cursor.fetchall()
+        elapsed = time.perf_counter() - start
 
-            print(f"{message}")
-        except Exception as e:
-            print(f"{e}: here is the message that didn't get logged:\n\t{message}")
+        if cursor.description is None:
+            col_names = ()
+            count = max(cursor.rowcount, 0)
+        else:
+            col_names = tuple(desc[0] for desc in cursor.description)
+            count = len(rows)
+
+        cls.query_log.record(query, params, elapsed, count)
+        metrics.add_time("db", elapsed)
+        return rows, col_names
+
+    @staticmethod
+    def warm_caches():
+        Database.games.load(Database.fetch_all_as_dict_arr(Database.GAMES_DB, "games"))
+
+    @staticmethod
+    def _row_written(db_path: str, table: str, row: dict):
+        # write-through so cached rows never go stale
+        if db_path == Database.GAMES_DB and table == "games":
+            Database.games.put(row)
+        elif db_path == Database.GAMES_DB and table == "contributors":
+            Database.contributors.put(row["discord_username"], row)
+
+    @staticmethod
+    def _row_deleted(db_path: str, table: str, row: dict):
+        if db_path == Database.GAMES_DB and table == "games":
+            Database.games.remove(row["id"])
+        elif db_path == Database.GAMES_DB and table == "contributors":
+            Database.contributors.invalidate(row["discord_username"])
 
     @staticmethod
     def add_game(name, repo_name, channel_id, owner):
@@ -53,47 +222,55 @@ class Database:
 
     @staticmethod
     def get_game_info(channel_id):
-        return Database.fetch_one_as_dict(
-            Database.GAMES_DB, "games", "channel_id = ?", (channel_id,)
-        )
+        found, game = Database.games.get_by_channel(channel_id)
+        if not found:
+            game = Database.fetch_one_as_dict(
+                Database.GAMES_DB, "games", "channel_id = ?", (channel_id,)
+            )
+            if game:
+                Database.games.put(game)
+        return game
+
+    @staticmethod
+    def get_game_by_id(game_id):
+        found, game = Database.games.get_by_id(game_id)
+        if not found:
+            game = Database.fetch_one_as_dict(
+                Database.GAMES_DB, "games", "id = ?", (game_id,)
+            )
+            if game:
+                Database.games.put(game)
+        return game
 
     @staticmethod
     def get_game_channel(game_id):
-        game = Database.fetch_one_as_dict(
-            Database.GAMES_DB, "games", "id = ?", (game_id,)
-        )
+        game = Database.get_game_by_id(game_id)
         return game["channel_id"] if game else None
 
     @staticmethod
     def get_default_game_info():
-        return Database.fetch_one_as_dict(Database.GAMES_DB, "games", "id = ?", (1,))
+        return Database.get_game_by_id(1)
 
     @staticmethod
     def get_game_leads(game_id):
-        list = []
-        game = Database.fetch_one_as_dict(
-            Database.GAMES_DB, "games", "id = ?", (game_id,)
-        )
-
-        list.append(game["owner"])
-
-        contributors = Database.fetch_all_as_dict_arr(
+        # owner first, then every Project Lead, in a single statement
+        rows = Database.execute(
             Database.GAMES_DB,
-            "game_contributors",
-            "game_id = ? AND role = 'Project Lead'",
-            (game_id,),
+            """
+            SELECT 0 AS lead_order, g.owner
+            FROM games g
+            WHERE g.id = ?
+            UNION ALL
+            SELECT 1, c.discord_username
+            FROM game_contributors gc
+            JOIN contributors c ON c.id = gc.contributor_id
+            WHERE gc.game_id = ? AND gc.role = 'Project Lead'
+            ORDER BY lead_order
+        """,
+            (game_id, game_id),
         )
-        for contributor in contributors:
-            contributor_info = Database.fetch_one_as_dict(
-                Database.GAMES_DB,
-                "contributors",
-                "id = ?",
-                (contributor["contributor_id"],),
-            )
-            if contributor_info:
-                list.append(contributor_info["discord_username"])
-        return list
-    
+        return [name for _, name in rows]
+
     @staticmethod
     def add_task(user_id, description, deadline=None, event_id=None):
         Database.insert_into_db(
@@ -105,6 +282,47 @@ class Database:
             event_id=event_id,
         )
 
+    @staticmethod
+    def mark_task_finished(task_id):
+        Database.update_field(Database.TASKS_DB, "tasks", task_id, "finished", 1)
+
+    @staticmethod
+    def get_tasks_for_user(user_id) -> list[tuple]:
+        """(id, description, deadline, finished) of the user's tasks that are not waiting on an event."""
+        return Database.execute(
+            Database.TASKS_DB,
+            """
+            SELECT t.id, t.description, t.deadline, t.finished
+            FROM tasks t
+            LEFT JOIN events e ON e.id = t.event_id
+            WHERE t.user_id = ? AND (t.event_id IS NULL OR e.triggered = 1)
+            ORDER BY t.deadline
+        """,
+            (user_id,),
+        )
+
+    @staticmethod
+    def add_event(name) -> int | None:
+        event = Database.insert_into_db(Database.EVENTS_DB, "events", name=name)
+        return event["id"] if event else None
+
+    @staticmethod
+    def trigger_event(event_id):
+        Database.update_field(Database.EVENTS_DB, "events", event_id, "triggered", 1)
+
+    @staticmethod
+    def get_contributor(discord_username):
+        found, contributor = Database.contributors.get(discord_username)
+        if not found:
+            contributor = Database.fetch_one_as_dict(
+                Database.GAMES_DB,
+                "contributors",
+                "discord_username = ?",
+                (discord_username,),
+            )
+            Database.contributors.put(discord_username, contributor)
+        return contributor
+
     @staticmethod
     def register_contributor(
         discord_username,
@@ -118,6 +336,8 @@ class Database:
         if time_zone is not None:
             time_zone = max(-12, min(14, time_zone))
 
+        # drop a cached "not registered" entry even if the insert fails
+        Database.contributors.invalidate(discord_username)
         Database.insert_into_db(
             Database.GAMES_DB,
             "contributors",
@@ -143,48 +363,65 @@ class Database:
         )
 
     @staticmethod
-    def mark_request_accepted(request_id, user):
-        Database.update_field(
-            Database.GAMES_DB, "asset_requests", request_id, "status", "Accepted"
-        )
-        Database.update_field(
-            Database.GAMES_DB, "asset_requests", request_id, "accepted_by", user
-        )
-
-    @staticmethod
-    def mark_request_finished(request_id):
-        Database.update_field(
-            Database.GAMES_DB, "asset_requests", request_id, "status", "Finished"
+    def mark_request_accepted(request_id, user) -> bool:
+        """Accept a pending request, False if someone else got to it first."""
+        return (
+            Database.transition(
+                Database.GAMES_DB,
+                "asset_requests",
+                request_id,
+                "status",
+                "Pending",
+                status="Accepted",
+                accepted_by=user,
+            )
+            is not None
         )
 
     @staticmethod
-    def is_request_pending(request: dict) -> bool:
-        row = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "asset_requests",
-            "id = ? AND status = 'Pending'",
-            (request["id"],),
+    def mark_request_finished(request_id) -> bool:
+        """Finish an accepted request, False if it isn't accepted (anymore)."""
+        return (
+            Database.transition(
+                Database.GAMES_DB,
+                "asset_requests",
+                request_id,
+                "status",
+                "Accepted",
+                status="Finished",
+            )
+            is not None
         )
-        return row is not None
 
     @staticmethod
-    def get_asset_requests_by_type(type, status="Pending", user=None):
+    def get_asset_requests_with_games(
+        type, status="Pending", user=None
+    ) -> list[tuple[dict, dict]]:
+        """Asset requests of one type joined with their game, as (request, game) pairs."""
+        where = "r.asset_type = ? AND r.status = ?"
+        params = (type, status)
         if user:
-            return Database.fetch_all_as_dict_arr(
-                Database.GAMES_DB,
-                "asset_requests",
-                # "asset_type = ? AND status = ? AND substr(requested_by, 1, instr(requested_by, ' ') - 1) = ?",
-                "asset_type = ? AND status = ? AND requested_by = ?",
-                (type, status, user),
-            )
-        else:
-            return Database.fetch_all_as_dict_arr(
-                Database.GAMES_DB,
-                "asset_requests",
-                f"asset_type = ? AND status = '{status}'",
-                (type,),
+            where += " AND r.requested_by = ?"
+            params += (user,)
+
+        with Database.connect(Database.GAMES_DB) as conn:
+            rows, col_names = Database._query(
+                conn,
+                f"""
+                SELECT r.*, g.*
+                FROM asset_requests r
+                JOIN games g ON g.id = r.game_id
+                WHERE {where}
+            """,
+                params,
             )
 
+        # the request columns come first, the game columns start at the second "id"
+        split = col_names.index("id", 1)
+        make_request = row_factory(col_names[:split])
+        make_game = row_factory(col_names[split:])
+        return [(make_request(row[:split]), make_game(row[split:])) for row in rows]
+
     @staticmethod
     def remove_asset_requests_for_game(game_id):
         Database.delete_from_db(
@@ -204,123 +441,311 @@ class Database:
         )
 
     @staticmethod
-    def insert_into_db(db_path, table, **columns) -> bool:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+    def get_audit_log(
+        table: str | None = None,
+        row_id: int | None = None,
+        actor: str | None = None,
+        since: int | None = None,
+        limit: int = 20,
+    ) -> list[dict]:
+        """The newest audit entries matching every given filter, `since` is a unix timestamp."""
+        # ids are only unique within a table
+        if row_id is not None and table is None:
+            raise ValueError("Filtering by row id needs a table")
+
+        conditions = []
+        params = []
+        for condition, value in (
+            ("table_name = ?", table),
+            ("row_id = ?", row_id),
+            ("actor = ?", actor),
+            ("at >= ?", since),
+        ):
+            if value is not None:
+                conditions.append(condition)
+                params.append(value)
+
+        where = " AND ".join(conditions) or "1=1"
+        with Database.connect(Database.GAMES_DB) as conn:
+            rows, col_names = Database._query(
+                conn,
+                f"SELECT * FROM audit_log WHERE {where} ORDER BY at DESC, id DESC LIMIT ?",
+                (*params, limit),
+            )
+
+        make_row = row_factory(col_names)
+        return [make_row(row) for row in rows]
+
+    # what /search looks through: kind -> (fts table, content table, title column)
+    SEARCHABLE = {
+        "game": ("games_fts", "games", "name"),
+        "contributor": ("contributors_fts", "contributors", "credit_name"),
+        "asset request": ("asset_requests_fts", "asset_requests", "content"),
+    }
+
+    @staticmethod
+    def search(
+        text: str, kinds: list[str] | None = None, limit: int = 10
+    ) -> list[dict]:
+        """
+        Full-text search over games, contributors and asset requests, best match first.
+        Every word has to match and the last one may be incomplete, so this also
+        serves autocomplete. Rows have kind, id, title, snippet and rank.
+        """
+        words = re.findall(r"\w+", text)
+        if not words:
+            return []
+        # quoted so user input can't use the FTS query syntax
+        match = " ".join(f'"{word}"' for word in words) + "*"
+
+        selects = []
+        params = []
+        for kind in kinds or Database.SEARCHABLE:
+            fts, table, title = Database.SEARCHABLE[kind]
+            selects.append(
+                f"SELECT '{kind}' AS kind, t.id, t.{title} AS title, "
+                # -1 picks whichever column matched best
+                f"snippet({fts}, -1, '**', '**', '…', 12) AS snippet, "
+                f"bm25({fts}) AS rank "
+                f"FROM {fts} JOIN {table} t ON t.id = {fts}.rowid "
+                f"WHERE {fts} MATCH ?"
+            )
+            params.append(match)
 
+        with Database.connect(Database.GAMES_DB) as conn:
+            rows, col_names = Database._query(
+                conn,
+                " UNION ALL ".join(selects) + " ORDER BY rank LIMIT ?",
+                (*params, limit),
+            )
+
+        make_row = row_factory(col_names)
+        return [make_row(row) for row in rows]
+
+    @staticmethod
+    def insert_into_db(db_path, table, **columns) -> dict | None:
+        """Insert one row, returns it as stored or None if a constraint failed."""
         keys = ", ".join(columns.keys())
         placeholders = ", ".join(["?"] * len(columns))
         values = tuple(columns.values())
         new_lines = "\n".join(f"    {k}: {v!r}" for k, v in columns.items())
 
-        try:
-            cursor.execute(
-                f"INSERT INTO {table} ({keys}) VALUES ({placeholders})", values
-            )
-            conn.commit()
+        with Database.connect(db_path) as conn:
+            try:
+                rows, col_names = Database._query(
+                    conn,
+                    f"INSERT INTO {table} ({keys}) VALUES ({placeholders}) RETURNING *",
+                    values,
+                )
+                row_id = rows[0][col_names.index("id")] if "id" in col_names else None
+                Database._audit(conn, table, "insert", [(row_id, columns)])
+                conn.commit()
+            except sqlite3.IntegrityError as e:
+                conn.rollback()
+                Database._log(
+                    f"**New entry failed to insert in `{table}`**: {e}\n```\n{new_lines}\n```\n"
+                )
+                return None
 
-            Database._log(f"**New entry in `{table}`**\n```\n{new_lines}\n```\n")
+        row = row_factory(col_names)(rows[0])
+        Database._row_written(db_path, table, row)
+        Database._log(f"**New entry in `{table}`**\n```\n{new_lines}\n```\n")
 
-            return True
-        except sqlite3.IntegrityError as e:
-            Database._log(
-                f"**New entry failed to insert in `{table}`**: {e}\n```\n{new_lines}\n```\n"
-            )
-            return False
-        finally:
-            conn.close()
+        return row
 
     @staticmethod
     def update_field(db_path: str, table: str, row_id: int, field: str, value):
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+        return Database.update_fields(db_path, table, row_id, **{field: value})
 
-        cursor.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,))
-        old_row = cursor.fetchone()
-        col_names = [desc[0] for desc in cursor.description]
-        old_dict = dict(zip(col_names, old_row)) if old_row else {}
+    @staticmethod
+    def update_fields(db_path: str, table: str, row_id: int, **changes) -> dict | None:
+        """
+        Update several columns of one row in a single transaction.
+        Returns the updated row, or None if no row has this id.
+        """
+        fields = ", ".join(changes)
+        assignments = ", ".join(f"{field} = ?" for field in changes)
+
+        with Database.connect(db_path) as conn:
+            # take the write lock up front so the old values can't change under us
+            conn.execute("BEGIN IMMEDIATE")
+            old_rows, _ = Database._query(
+                conn, f"SELECT {fields} FROM {table} WHERE id = ?", (row_id,)
+            )
 
-        # Use parameterized query to avoid SQL injection
-        query = f"UPDATE {table} SET {field} = ? WHERE id = ?"
-        cursor.execute(query, (value, row_id))
-        conn.commit()
+            # Use parameterized query to avoid SQL injection
+            new_row, col_names = Database._query(
+                conn,
+                f"UPDATE {table} SET {assignments} WHERE id = ? RETURNING *",
+                (*changes.values(), row_id),
+            )
 
-        cursor.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,))
-        new_row = cursor.fetchone()
-        new_dict = dict(zip(col_names, new_row)) if new_row else {}
+            # only record the columns whose value actually changed
+            changed = {}
+            if new_row:
+                new_values = dict(zip(col_names, new_row[0]))
+                changed = {
+                    field: [old, new_values[field]]
+                    for field, old in zip(changes, old_rows[0])
+                    if old != new_values[field]
+                }
+                if changed:
+                    Database._audit(conn, table, "update", [(row_id, changed)])
+            conn.commit()
 
-        conn.close()
+        if not new_row:
+            Database._log(f"Update on `{table}` matched no row (id={row_id})")
+            return None
 
-        old_lines = "\n".join(f"    {k}: {v!r}" for k, v in old_dict.items())
-        new_lines = "\n".join(f"    {k}: {v!r}" for k, v in new_dict.items())
+        new_dict = row_factory(col_names)(new_row[0])
+        Database._row_written(db_path, table, new_dict)
 
-        log_message = f"**Updated `{table}`**\nBefore:\n```\n{old_lines}\n```\nAfter:\n```\n{new_lines}\n```"
+        diff_lines = "\n".join(
+            f"    {field}: {old!r} -> {new!r}" for field, (old, new) in changed.items()
+        )
+        if diff_lines:
+            Database._log(
+                f"**Updated `{table}` (id={row_id})**\n```\n{diff_lines}\n```"
+            )
+
+        return new_dict
+
+    @staticmethod
+    def transition(
+        db_path: str, table: str, row_id: int, field: str, expected, **changes
+    ) -> dict | None:
+        """
+        Compare-and-set: apply `changes` to the row only while its `field` still equals
+        `expected`, in a single statement so concurrent callers can't both succeed.
+        Returns the updated row, or None if the row is missing or no longer `expected`.
+        """
+        assignments = ", ".join(f"{column} = ?" for column in changes)
+
+        with Database.connect(db_path) as conn:
+            rows, col_names = Database._query(
+                conn,
+                f"UPDATE {table} SET {assignments} WHERE id = ? AND {field} = ? RETURNING *",
+                (*changes.values(), row_id, expected),
+            )
+            if rows:
+                Database._audit(
+                    conn, table, "transition", [(row_id, {"from": expected, **changes})]
+                )
+            conn.commit()
+
+        if not rows:
+            return None
 
-        Database._log(log_message)
+        row = row_factory(col_names)(rows[0])
+        Database._row_written(db_path, table, row)
+
+        changed_lines = "\n".join(f"    {k}: {v!r}" for k, v in changes.items())
+        Database._log(
+            f"**Updated `{table}` (id={row_id}) from {field} {expected!r}**\n```\n{changed_lines}\n```"
+        )
+        return row
 
     @staticmethod
     def fetch_one_as_dict(
         db_path: str, table: str, where: str, params: tuple = ()
     ) -> dict | None:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         query = f"SELECT * FROM {table} WHERE {where} LIMIT 1"
-        print(f"Executing query: {query} with params: {params}")
-        cursor.execute(query, params)
-        row = cursor.fetchone()
-        if not row:
-            print("No row found")
-            conn.close()
-            return None
 
-        col_names = [desc[0] for desc in cursor.description]
-        conn.close()
+        with Database.connect(db_path) as conn:
+            rows, col_names = Database._query(conn, query, params)
+
+        if not rows:
+            return None
 
-        return dict(zip(col_names, row))
+        return row_factory(col_names)(rows[0])
 
     @staticmethod
     def fetch_all_as_dict_arr(
         db_path: str, table: str, where: str = "1=1", params: tuple = ()
     ) -> list[dict]:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-
         query = f"SELECT * FROM {table} WHERE {where}"
-        print(f"Executing query: {query} with params: {params}")
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
+
+        with Database.connect(db_path) as conn:
+            rows, col_names = Database._query(conn, query, params)
 
         if not rows:
-            print("No rows found")
-            conn.close()
             return []
 
-        col_names = [desc[0] for desc in cursor.description]
-        conn.close()
-
-        return [dict(zip(col_names, row)) for row in rows]
+        make_row = row_factory(col_names)
+        return [make_row(row) for row in rows]
 
     @staticmethod
-    def delete_from_db(db_path: str, table: str, where: str, params: tuple = ()):
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
+    def iter_pages(
+        db_path: str,
+        table: str,
+        columns: tuple[str, ...] = ("*",),
+        where: str = "1=1",
+        params: tuple = (),
+        key: str = "id",
+        page_size: int = 500,
+    ):
+        """
+        Yield the matching rows as lists of dicts, `page_size` rows at a time.
+        Pages are read with keyset pagination on `key`, so memory stays flat
+        however large the table is and the connection isn't held between pages.
+        """
+        if "*" not in columns and key not in columns:
+            columns = (key, *columns)
+        projection = ", ".join(columns)
+
+        last_key = None
+        while True:
+            if last_key is None:
+                query = f"SELECT {projection} FROM {table} WHERE {where} ORDER BY {key} LIMIT ?"
+                query_params = (*params, page_size)
+            else:
+                query = f"SELECT {projection} FROM {table} WHERE ({where}) AND {key} > ? ORDER BY {key} LIMIT ?"
+                query_params = (*params, last_key, page_size)
+
+            with Database.connect(db_path) as conn:
+                rows, col_names = Database._query(conn, query, query_params)
+
+            if rows:
+                make_row = row_factory(col_names)
+                yield [make_row(row) for row in rows]
+
+            if len(rows) < page_size:
+                return
 
-        cursor.execute(f"SELECT * FROM {table} WHERE {where}", params)
-        rows = cursor.fetchall()
-        col_names = [d[0] for d in cursor.description]
+            last_key = rows[-1][col_names.index(key)]
 
-        query = f"DELETE FROM {table} WHERE {where}"
-        print(f"Executing query: {query} with params: {params}")
-        cursor.execute(query, params)
+    @staticmethod
+    def iter_rows(db_path: str, table: str, **kwargs):
+        """Yield the matching rows one dict at a time, see `iter_pages` for the arguments."""
+        for page in Database.iter_pages(db_path, table, **kwargs):
+            yield from page
 
-        conn.commit()
-        conn.close()
+    @staticmethod
+    def delete_from_db(db_path: str, table: str, where: str, params: tuple = ()):
+        with Database.connect(db_path) as conn:
+            rows, col_names = Database._query(
+                conn, f"SELECT * FROM {table} WHERE {where}", params
+            )
+            Database._query(conn, f"DELETE FROM {table} WHERE {where}", params)
+            Database._audit(
+                conn,
+                table,
+                "delete",
+                [
+                    (
+                        row[col_names.index("id")] if "id" in col_names else None,
+                        dict(zip(col_names, row)),
+                    )
+                    for row in rows
+                ],
+            )
+            conn.commit()
 
         if rows:
             msg_lines = [f"**Deleted from `{table}`**\n```\n"]
             for row in rows:
-                row_dict = dict(zip(col_names, row))
+                row_dict = row_factory(col_names)(row)
+                Database._row_deleted(db_path, table, row_dict)
                 formatted_row = "\n".join(
                     f"    {k}: {v!r}" for k, v in row_dict.items()
                 )
@@ -340,123 +765,174 @@ class Database:
 
     @staticmethod
     def execute(db_path: str, query: str, params: tuple = ()) -> list[tuple]:
-        conn = sqlite3.connect(db_path)
-        cursor = conn.cursor()
-        cursor.execute(query, params)
-        rows = cursor.fetchall()
-        conn.close()
+        with Database.connect(db_path) as conn:
+            rows, _ = Database._query(conn, query, params)
+            if conn.in_transaction:
+                conn.commit()
         return rows
 
+    # --- awaitable counterparts, safe to call from cog handlers ---
+
+    @staticmethod
+    async def arun(func, *args, **kwargs):
+        """Run a synchronous Database helper on the database thread and await it."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        return await loop.run_in_executor(Database._executor, call)
 
-def setup_db(db_name, table_schemas):
-    conn = sqlite3.connect(db_name)
-    conn.close()
+    @staticmethod
+    async def awarm_caches():
+        return await Database.arun(Database.warm_caches)
 
-    conn = sqlite3.connect(db_name)
-    cursor = conn.cursor()
-    for schema in table_schemas:
-        cursor.execute(
-            f"CREATE TABLE IF NOT EXISTS {schema['name']} ({schema['columns']})"
+    @staticmethod
+    async def aadd_game(name, repo_name, channel_id, owner):
+        return await Database.arun(
+            Database.add_game, name, repo_name, channel_id, owner
         )
-    conn.commit()
-    conn.close()
-
-
-# Add new fields to existing tables
-NEW_FIELDS = {
-    "contributors": [
-        ("time_zone", "INTEGER DEFAULT NULL"),
-        ("trust_points", "INTEGER DEFAULT 0"),
-        ("trust_remarks", "TEXT DEFAULT NULL"),
-    ],
-    "games": [
-        ("gdd_link", "TEXT DEFAULT NULL"),
-        ("state", "INTEGER DEFAULT 0"),
-    ],
-}
-
-
-def apply_schema_updates(db_path=Database.GAMES_DB):
-    conn = sqlite3.connect(db_path)
-    c = conn.cursor()
-
-    for table, new_columns in NEW_FIELDS.items():
-        # skip tables that don't exist
-        c.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,)
+
+    @staticmethod
+    async def aget_game_info(channel_id):
+        return await Database.arun(Database.get_game_info, channel_id)
+
+    @staticmethod
+    async def aget_game_by_id(game_id):
+        return await Database.arun(Database.get_game_by_id, game_id)
+
+    @staticmethod
+    async def aget_game_channel(game_id):
+        return await Database.arun(Database.get_game_channel, game_id)
+
+    @staticmethod
+    async def aget_default_game_info():
+        return await Database.arun(Database.get_default_game_info)
+
+    @staticmethod
+    async def aget_game_leads(game_id):
+        return await Database.arun(Database.get_game_leads, game_id)
+
+    @staticmethod
+    async def aadd_task(user_id, description, deadline=None, event_id=None):
+        return await Database.arun(
+            Database.add_task, user_id, description, deadline, event_id
         )
-        if not c.fetchone():
-            print(f"Table '{table}' not found, skipping.")
-            continue
-
-        # get existing columns
-        c.execute(f"PRAGMA table_info({table})")
-        existing = [row[1] for row in c.fetchall()]
-
-        # add any missing columns
-        for name, coltype in new_columns:
-            if name not in existing:
-                print(f"Adding column '{name}' to table '{table}'")
-                c.execute(f"ALTER TABLE {table} ADD COLUMN {name} {coltype}")
-
-    conn.commit()
-    conn.close()
-
-
-os.makedirs("dbs", exist_ok=True)
-setup_db(
-    Database.GAMES_DB,
-    [
-        {
-            "name": "games",
-            "columns": "id INTEGER PRIMARY KEY, name TEXT, repo_name TEXT, channel_id INTEGER, owner TEXT, owner_display_name TEXT, itch_io_link TEXT",
-        }
-    ],
-)
-setup_db(
-    Database.TASKS_DB,
-    [
-        {
-            "name": "tasks",
-            "columns": "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, description TEXT NOT NULL, deadline TEXT, finished INTEGER DEFAULT 0, event_id INTEGER DEFAULT NULL",
-        }
-    ],
-)
-setup_db(
-    Database.EVENTS_DB,
-    [
-        {
-            "name": "events",
-            "columns": "id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, triggered INTEGER DEFAULT 0",
-        }
-    ],
-)
-setup_db(
-    Database.GAMES_DB,
-    [
-        {
-            "name": "contributors",
-            "columns": "id INTEGER PRIMARY KEY AUTOINCREMENT, discord_username TEXT NOT NULL, discord_display_name TEXT, credit_name TEXT NOT NULL, itch_io_link TEXT, alt_link TEXT",
-        }
-    ],
-)
-setup_db(
-    Database.GAMES_DB,
-    [
-        {
-            "name": "game_contributors",
-            "columns": "game_id INTEGER NOT NULL, contributor_id INTEGER NOT NULL, role TEXT NOT NULL, PRIMARY KEY (game_id, contributor_id, role), FOREIGN KEY (game_id) REFERENCES games(id), FOREIGN KEY (contributor_id) REFERENCES contributors(id)",
-        }
-    ],
-)
-setup_db(
-    Database.GAMES_DB,
-    [
-        {
-            "name": "asset_requests",
-            "columns": "id INTEGER PRIMARY KEY AUTOINCREMENT, game_id INTEGER NOT NULL, asset_type TEXT NOT NULL, content TEXT NOT NULL, context TEXT, requested_by INTEGER NOT NULL, accepted_by INTEGER, status TEXT NOT NULL, FOREIGN KEY (game_id) REFERENCES games(id), FOREIGN KEY (requested_by) REFERENCES contributors(id), FOREIGN KEY (accepted_by) REFERENCES contributors(id)",
-        }
-    ],
-)
-
-apply_schema_updates()
+
+    @staticmethod
+    async def amark_task_finished(task_id):
+        return await Database.arun(Database.mark_task_finished, task_id)
+
+    @staticmethod
+    async def aget_tasks_for_user(user_id):
+        return await Database.arun(Database.get_tasks_for_user, user_id)
+
+    @staticmethod
+    async def aadd_event(name):
+        return await Database.arun(Database.add_event, name)
+
+    @staticmethod
+    async def atrigger_event(event_id):
+        return await Database.arun(Database.trigger_event, event_id)
+
+    @staticmethod
+    async def aget_contributor(discord_username):
+        return await Database.arun(Database.get_contributor, discord_username)
+
+    @staticmethod
+    async def aregister_contributor(discord_username, credit_name, **kwargs):
+        return await Database.arun(
+            Database.register_contributor, discord_username, credit_name, **kwargs
+        )
+
+    @staticmethod
+    async def aadd_asset_request(**kwargs):
+        return await Database.arun(Database.add_asset_request, **kwargs)
+
+    @staticmethod
+    async def amark_request_accepted(request_id, user):
+        return await Database.arun(Database.mark_request_accepted, request_id, user)
+
+    @staticmethod
+    async def amark_request_finished(request_id):
+        return await Database.arun(Database.mark_request_finished, request_id)
+
+    @staticmethod
+    async def aget_asset_requests_with_games(type, status="Pending", user=None):
+        return await Database.arun(
+            Database.get_asset_requests_with_games, type, status, user
+        )
+
+    @staticmethod
+    async def aremove_asset_requests_for_game(game_id):
+        return await Database.arun(Database.remove_asset_requests_for_game, game_id)
+
+    @staticmethod
+    async def aget_audit_log(**filters):
+        return await Database.arun(Database.get_audit_log, **filters)
+
+    @staticmethod
+    async def asearch(text, kinds=None, limit=10):
+        return await Database.arun(Database.search, text, kinds, limit)
+
+    @staticmethod
+    async def ainsert_into_db(db_path, table, **columns) -> dict | None:
+        return await Database.arun(Database.insert_into_db, db_path, table, **columns)
+
+    @staticmethod
+    async def aupdate_field(db_path: str, table: str, row_id: int, field: str, value):
+        return await Database.arun(
+            Database.update_field, db_path, table, row_id, field, value
+        )
+
+    @staticmethod
+    async def aupdate_fields(
+        db_path: str, table: str, row_id: int, **changes
+    ) -> dict | None:
+        return await Database.arun(
+            Database.update_fields, db_path, table, row_id, **changes
+        )
+
+    @staticmethod
+    async def atransition(db_path, table, row_id, field, expected, **changes):
+        return await Database.arun(
+            Database.transition, db_path, table, row_id, field, expected, **changes
+        )
+
+    @staticmethod
+    async def afetch_one_as_dict(
+        db_path: str, table: str, where: str, params: tuple = ()
+    ) -> dict | None:
+        return await Database.arun(
+            Database.fetch_one_as_dict, db_path, table, where, params
+        )
+
+    @staticmethod
+    async def afetch_all_as_dict_arr(
+        db_path: str, table: str, where: str = "1=1", params: tuple = ()
+    ) -> list[dict]:
+        return await Database.arun(
+            Database.fetch_all_as_dict_arr, db_path, table, where, params
+        )
+
+    @staticmethod
+    async def aiter_rows(db_path: str, table: str, **kwargs):
+        """Async version of `iter_rows`, every page is read on the database thread."""
+        pages = Database.iter_pages(db_path, table, **kwargs)
+        while True:
+            page = await Database.arun(next, pages, None)
+            if page is None:
+                return
+            for row in page:
+                yield row
+
+    @staticmethod
+    async def adelete_from_db(db_path: str, table: str, where: str, params: tuple = ()):
+        return await Database.arun(
+            Database.delete_from_db, db_path, table, where, params
+        )
+
+    @staticmethod
+    async def aentry_exists(db_path: str, table: str, field: str, value) -> bool:
+        return await Database.arun(Database.entry_exists, db_path, table, field, value)
+
+    @staticmethod
+    async def aexecute(db_path: str, query: str, params: tuple = ()) -> list[tuple]:
+        return await Database.arun(Database.execute, db_path, query, params)
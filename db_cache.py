@@ -0,0 +1,160 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class GameCache:
+    """
+    Process-wide copy of the games table, indexed by channel id and game id.
+    Once warmed with the whole table a lookup miss means the game doesn't exist,
+    so those lookups don't need to touch the database either.
+    Cached rows are handed out as-is and must not be modified.
+    """
+
+    def __init__(self):
+        self._by_id: dict[int, dict] = {}
+        self._by_channel: dict[int, dict] = {}
+        self._lock = threading.Lock()
+
+        self.warm = False
+        self.hits = 0
+        self.misses = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._by_id),
+            "warm": self.warm,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def load(self, games: list[dict]):
+        """Replace the cache contents with the complete games table."""
+        with self._lock:
+            self._by_id = {game["id"]: game for game in games}
+            self._by_channel = {
+                game["channel_id"]: game for game in self._by_id.values()
+            }
+            self.warm = True
+
+    def clear(self):
+        with self._lock:
+            self._by_id.clear()
+            self._by_channel.clear()
+            self.warm = False
+
+    def put(self, game: dict):
+        with self._lock:
+            old = self._by_id.get(game["id"])
+            if old is not None and self._by_channel.get(old["channel_id"]) is old:
+                del self._by_channel[old["channel_id"]]
+
+            self._by_id[game["id"]] = game
+            self._by_channel[game["channel_id"]] = game
+
+    def remove(self, game_id: int):
+        with self._lock:
+            old = self._by_id.pop(game_id, None)
+            if old is not None and self._by_channel.get(old["channel_id"]) is old:
+                del self._by_channel[old["channel_id"]]
+
+    def get_by_id(self, game_id: int) -> tuple[bool, dict | None]:
+        return self._get(self._by_id, game_id)
+
+    def get_by_channel(self, channel_id: int) -> tuple[bool, dict | None]:
+        return self._get(self._by_channel, channel_id)
+
+    def _get(self, index: dict, key) -> tuple[bool, dict | None]:
+        """Returns (found, game); found is False when the database has to be asked."""
+        with self._lock:
+            game = index.get(key)
+            if game is not None or self.warm:
+                self.hits += 1
+                return True, game
+
+            self.misses += 1
+            return False, None
+
+
+class ContributorCache:
+    """
+    Bounded LRU of contributor rows keyed by Discord username.
+    Entries expire after `ttl` seconds; unregistered users are cached as None too.
+    Cached rows are handed out as-is and must not be modified.
+    """
+
+    def __init__(self, max_size: int = 512, ttl: float = 300.0):
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self._entries: OrderedDict[str, tuple[float, dict | None]] = OrderedDict()
+        self._usernames: dict[int, str] = {}  # contributor id -> cached username
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.negative_hits = 0  # hits for users that aren't registered
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def get(self, discord_username: str) -> tuple[bool, dict | None]:
+        """Returns (found, contributor); found is False when the database has to be asked."""
+        with self._lock:
+            entry = self._entries.get(discord_username)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            stored_at, contributor = entry
+            if time.monotonic() - stored_at > self.ttl:
+                self._pop(discord_username)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(discord_username)
+            self.hits += 1
+            if contributor is None:
+                self.negative_hits += 1
+            return True, contributor
+
+    def put(self, discord_username: str, contributor: dict | None):
+        with self._lock:
+            if contributor is not None:
+                # the username of a cached id may have changed, drop the old key
+                old_username = self._usernames.get(contributor["id"])
+                if old_username is not None and old_username != discord_username:
+                    self._pop(old_username)
+                self._usernames[contributor["id"]] = discord_username
+
+            self._entries[discord_username] = (time.monotonic(), contributor)
+            self._entries.move_to_end(discord_username)
+
+            while len(self._entries) > self.max_size:
+                self._pop(next(iter(self._entries)))
+                self.evictions += 1
+
+    def invalidate(self, discord_username: str):
+        with self._lock:
+            self._pop(discord_username)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._usernames.clear()
+
+    def _pop(self, discord_username: str):
+        _, contributor = self._entries.pop(discord_username, (None, None))
+        if contributor is not None:
+            self._usernames.pop(contributor["id"], None)
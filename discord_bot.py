@@ -1,61 +1,122 @@
+import logging
 import os
-import sys
-import traceback
-from pathlib import Path
 
 import discord
-from dotenv import load_dotenv
-from github import Auth, Github
 
+import config
+from admin import Admin
+from backups import backup_job
 from chain import Chain
 from contributors import Contributors
+from data_transfer import BOT_PID_PATH
 from databases import Database
 from fun import Fun
 from game import Game
 from game_channel import GameChannel
+from github_wrapper import GithubWrapper
 from help import Help
+from loop_monitor import loop_watchdog
+from maintenance import maintenance_job
+from metrics import TimedContext, metrics
+from migrations import migrate
 from onboarding import Onboarding
 from potato import Potato
+from query_log import start_logging, stop_logging
 from remake import Remake
 from report import Report
+from search import Search
 from sfx_request import SFXRequests
 
-# load all the variables from the env file
-load_dotenv()
+log = logging.getLogger("bot")
+interaction_log = logging.getLogger("bot.interaction")
 
-GUILD_IDS = [int(os.getenv("GUILD_ID"))]  # your server IDs
-
-# GitHub App credentials
-GITHUB_APP_ID = os.getenv("GITHUB_APP_ID")  # GitHub App ID
-PRIVATE_KEY_PATH = Path(
-    "100devs-discord-bot.2025-08-26.private-key.pem"  # downloaded private key
-)
-GITHUB_INSTALLATION_ID = os.getenv(
-    "GITHUB_INSTALLATION_ID"
-)  # App installation ID for the repo/org
 REPO_OWNER = "100-Devs-1-Game"
 REPO_NAME = "ProjectTemplate"
 
-assert GITHUB_APP_ID
-assert GITHUB_INSTALLATION_ID
+# commands limited to our server, their guild ids are filled in at startup
+# once the config is loaded
+GUILD_COMMANDS: list[discord.SlashCommand] = []
 
-appauth = Auth.AppAuth(GITHUB_APP_ID, PRIVATE_KEY_PATH.read_text())
-installauth = appauth.get_installation_auth(int(GITHUB_INSTALLATION_ID))
 
-GITHUB = Github(auth=installauth)
+class Bot(discord.Bot):
+    async def get_application_context(self, interaction, cls=None):
+        return await super().get_application_context(
+            interaction, cls=cls or TimedContext
+        )
 
-bot = discord.Bot(intents=discord.Intents.all())
+    async def invoke_application_command(self, ctx: discord.ApplicationContext):
+        with metrics.command(ctx.command.qualified_name):
+            try:
+                await super().invoke_application_command(ctx)
+            finally:
+                # a group has swapped in its subcommand by now
+                metrics.set_command(ctx.command.qualified_name)
+
+    async def on_application_command_error(
+        self, ctx: discord.ApplicationContext, error: discord.DiscordException
+    ):
+        metrics.error(ctx.command.qualified_name)
+        # keeps py-cord's default handler, which prints the traceback
+        await super().on_application_command_error(ctx, error)
+
+    async def close(self):
+        # post the remaining db log entries while we are still connected
+        await Database.log_sink.close()
+        backup_job.stop()
+        maintenance_job.stop()
+        metrics.stop()
+        loop_watchdog.stop()
+        await super().close()
+        GithubWrapper.close()
+
+
+bot = Bot(intents=discord.Intents.all())
+
+# served next to the command metrics
+metrics.add_stats(
+    "game_cache", "Games cache", Database.games.stats, counters=("hits", "misses")
+)
+metrics.add_stats(
+    "contributor_cache",
+    "Contributors cache",
+    Database.contributors.stats,
+    counters=("hits", "negative_hits", "misses", "evictions", "expirations"),
+)
+metrics.add_stats(
+    "db_log",
+    "Db log channel sink",
+    Database.log_sink.stats,
+    counters=("dropped", "failed", "sent", "batched", "rate_limited"),
+)
 
 
 # A decorator to create guild-specific slash commands
 def guild_slash_command(**kwargs):
-    kwargs["guild_ids"] = GUILD_IDS
-    return bot.slash_command(**kwargs)
+    def decorator(func):
+        command = bot.slash_command(**kwargs)(func)
+        GUILD_COMMANDS.append(command)
+        return command
+
+    return decorator
 
 
 @bot.event
 async def on_ready():
-    print(f"{bot.user} is ready and online!")
+    Database.log_sink.start()
+    backup_job.start()
+    maintenance_job.start()
+    metrics.start(bot)
+    loop_watchdog.start()
+    await Database.awarm_caches()
+    log.info(f"{bot.user} is ready and online!")
+
+
+@bot.before_invoke
+async def before_command(ctx: discord.ApplicationContext):
+    # database writes made by the command are attributed to its user in audit_log
+    Database.set_actor(ctx.author)
+    # only called for the subcommand of a group, so blocks are reported under it
+    metrics.set_command(ctx.command.qualified_name)
 
 
 @bot.listen
@@ -66,29 +127,26 @@ async def on_interaction(interaction: discord.Interaction):
         channel = f"'#{interaction.channel if interaction.channel else 'N/A'}'"
 
         if interaction.type == discord.InteractionType.application_command:
-            print(
+            interaction_log.info(
                 f"[SlashCommand] {user} used /{interaction.data['name']} in {guild} {channel} with data:\n\t{interaction.data}"
             )
         elif interaction.type == discord.InteractionType.component:
-            print(
+            interaction_log.info(
                 f"[Component] {user} clicked on component in {guild} {channel} with data:\n\t{interaction.data}"
             )
         elif interaction.type == discord.InteractionType.modal_submit:
-            print(
+            interaction_log.info(
                 f"[ModalSubmit] {user} submitted modal in {guild} {channel} with data:\n\t{interaction.data}"
             )
         else:
-            print(
+            interaction_log.info(
                 f"[OtherInteraction] {user} triggered interaction in {guild} {channel} with data:\n\t{interaction.data}"
             )
 
     except Exception as e:
-        print(
+        interaction_log.exception(
             f"[InteractionError] Exception while logging interaction from user {user} in {guild} {channel}: {e}\nInteraction: {interaction}"
         )
-        traceback.print_exc()
-
-    sys.stdout.flush()
 
 
 @guild_slash_command(
@@ -122,17 +180,29 @@ async def lintorder(ctx: discord.ApplicationContext):
 
 @bot.slash_command(name="create_issue", description="Create a GitHub issue")
 async def create_issue(ctx: discord.ApplicationContext, title: str, body: str = ""):
-    created_issue = GITHUB.get_repo(f"{REPO_OWNER}/{REPO_NAME}").create_issue(
-        title, body
+    created_issue = await GithubWrapper.acreate_issue(
+        f"{REPO_OWNER}/{REPO_NAME}", title, body
     )
     issue_url = created_issue.html_url
     await ctx.respond(f"Issue created! {issue_url}", ephemeral=True)
 
 
 if __name__ == "__main__":
+    # read .env once, importing the modules above did no I/O
+    config.load()
+
+    # everything below logs through a queue drained by a background thread
+    start_logging()
+
+    # create or upgrade the database schema before anything queries it
+    migrate()
+
     # for logging db changes to discord
     Database.init(bot)
 
+    for command in GUILD_COMMANDS:
+        command.guild_ids = [config.get_int("GUILD_ID")]  # your server IDs
+
     bot.add_cog(Potato(bot))
     bot.add_cog(Fun(bot))
     bot.add_cog(Help(bot))
@@ -147,5 +217,16 @@ if __name__ == "__main__":
     bot.add_cog(SFXRequests(bot))
     bot.add_cog(Remake(bot))
     bot.add_cog(Chain(bot))
+    bot.add_cog(Admin(bot))
+    bot.add_cog(Search(bot))
+
+    # lets the data_transfer CLI refuse to import behind the bot's caches
+    with open(BOT_PID_PATH, "w") as file:
+        file.write(str(os.getpid()))
+    try:
+        bot.run(config.get("TOKEN"))  # run the bot with the token
+    finally:
+        os.remove(BOT_PID_PATH)
 
-    bot.run(os.getenv("TOKEN"))  # run the bot with the token
+    Database.close_all()
+    stop_logging()
@@ -1,13 +1,11 @@
-import os
-from datetime import datetime, timezone
 from enum import IntEnum
 
 import discord
 from discord import Interaction
 from discord.ext import commands
 from discord.ui import InputText, Modal
-from dotenv import load_dotenv
 
+import config
 from databases import Database
 from github_wrapper import GithubWrapper
 from utils import Utils
@@ -20,14 +18,7 @@ class GameState(IntEnum):
     CANCELLED = 3
 
 
-Utils.ensure_env_var("QA_CHANNEL_ID", "1416625126136483890")  # Test server
-Utils.ensure_env_var("SCHEDULE_CHANNEL_ID", "1416666323831885905")  # Test server
-load_dotenv()
-
-TEST_CHANNEL_ID = int(os.getenv("TEST_CHANNEL_ID", "0"))
 ITCHIO_REQUEST_CHANNEL_ID = 1415533889891598336
-QA_CHANNEL_ID = int(os.getenv("QA_CHANNEL_ID"))
-SCHEDULE_CHANNEL_ID = int(os.getenv("SCHEDULE_CHANNEL_ID", "0"))
 
 
 class Game(commands.Cog):
@@ -40,10 +31,10 @@ class Game(commands.Cog):
         description="Show information about the game associated with this channel"
     )
     async def info(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game info found for this channel.", ephemeral=True)
@@ -53,20 +44,21 @@ class Game(commands.Cog):
 
     @group.command(description="Get a list of all games under development")
     async def list(self, ctx: discord.ApplicationContext):
-        games: list[dict] = Database.fetch_all_as_dict_arr(
+        games = Database.aiter_rows(
             Database.GAMES_DB,
             "games",
+            columns=("repo_name", "itch_io_link", "channel_id"),
+            where="state = ?",
+            params=(GameState.IN_PROGRESS.value,),
         )
-
-        games = [game for game in games if game["state"] == GameState.IN_PROGRESS]
         await Game.send_games_list(ctx, games)
 
     @group.command(description="Set or update the description for your game")
     async def setdescription(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
@@ -84,10 +76,10 @@ class Game(commands.Cog):
 
     @group.command(description="Set the itch.io link for your game")
     async def setitchiolink(self, ctx: discord.ApplicationContext, link: str):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
@@ -99,17 +91,17 @@ class Game(commands.Cog):
             )
             return
 
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB, "games", game_info["id"], "itch_io_link", link
         )
         await ctx.respond("Itch.io link updated.", ephemeral=True)
 
     @group.command(description="Set the repository name for your game")
     async def setreponame(self, ctx: discord.ApplicationContext, repo_name: str):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
@@ -121,7 +113,7 @@ class Game(commands.Cog):
             )
             return
 
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB, "games", game_info["id"], "repo_name", repo_name
         )
         await ctx.respond("Repository name updated.", ephemeral=True)
@@ -130,10 +122,10 @@ class Game(commands.Cog):
         description="Builds executables and deploys the HTML export to itch.io"
     )
     async def build(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
@@ -141,7 +133,7 @@ class Game(commands.Cog):
 
         if (
             ctx.author.name != game_info["owner"]
-            and not Game.is_contributor(ctx, game_info)
+            and not await Game.is_contributor(ctx, game_info)
             and not ctx.author.guild_permissions.manage_guild
         ):
             await ctx.respond(
@@ -152,42 +144,17 @@ class Game(commands.Cog):
 
         await ctx.defer(ephemeral=True)  # immediately tells Discord "working on it"
 
-        g = GithubWrapper.get_github()
         repo_url = "100-Devs-1-Game/" + game_info["repo_name"]
         print("Fetching repo:", repo_url)
-        repo = g.get_repo(repo_url)
+        repo = await GithubWrapper.aget_repo(repo_url)
 
         if not repo:
             await ctx.followup.send("Could not find the repository.", ephemeral=True)
             return
 
-        sha = repo.get_branch("main").commit.sha
-
-        # base tag = YYYY.MM.DD
-        today = datetime.now(timezone.utc).strftime("%Y.%m.%d")
-        base_tag = f"v{today}"
-
-        # fetch existing tags
-        tags = [t.name for t in repo.get_tags()]
+        sha = await GithubWrapper.arun(lambda: repo.get_branch("main").commit.sha)
 
-        # ensure uniqueness for today
-        matches = [t for t in tags if t.startswith(base_tag)]
-        if not matches:
-            new_tag = base_tag
-        else:
-            counters = []
-            for m in matches:
-                parts = m.split("-")
-                if len(parts) > 1 and parts[1].isdigit():
-                    counters.append(int(parts[1]))
-            next_counter = max(counters, default=0) + 1
-            new_tag = f"{base_tag}-{next_counter}"
-
-        # create tag object + ref
-        tag = repo.create_git_tag(
-            tag=new_tag, message=f"Release {new_tag}", object=sha, type="commit"
-        )
-        repo.create_git_ref(ref=f"refs/tags/{new_tag}", sha=tag.sha)
+        await GithubWrapper.acreate_release_tag(repo, sha)
 
         await ctx.followup.send(
             f"Building new release for <{repo.html_url}>", ephemeral=True
@@ -195,10 +162,10 @@ class Game(commands.Cog):
 
     @group.command(description="Get the itch.io link of the owner of this game")
     async def getowneritchiolink(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
 
         if not game_info:
@@ -207,12 +174,7 @@ class Game(commands.Cog):
 
         owner = ctx.guild.get_member_named(game_info["owner"])
 
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (owner.name,),
-        )
+        contributor = await Database.aget_contributor(owner.name)
 
         if not contributor:
             await ctx.channel.send(
@@ -246,16 +208,16 @@ class Game(commands.Cog):
         description="Request to get admin ( and contributor ) access to the itch.io page of this game"
     )
     async def requestitchio(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
             return
 
-        if ctx.author.name != game_info["owner"] and not Game.is_contributor(
+        if ctx.author.name != game_info["owner"] and not await Game.is_contributor(
             ctx, game_info
         ):
             await ctx.respond(
@@ -264,12 +226,7 @@ class Game(commands.Cog):
             )
             return
 
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (ctx.author.name,),
-        )
+        contributor = await Database.aget_contributor(ctx.author.name)
 
         if not contributor:
             await ctx.respond(
@@ -316,10 +273,10 @@ class Game(commands.Cog):
 
     @group.command(description="Remove all pending requests for this game")
     async def removerequests(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
@@ -330,7 +287,7 @@ class Game(commands.Cog):
             )
             return
 
-        Database.remove_asset_requests_for_game(game_info["id"])
+        await Database.aremove_asset_requests_for_game(game_info["id"])
 
         await ctx.defer()
 
@@ -338,10 +295,8 @@ class Game(commands.Cog):
         await Utils.purge_messages_with_game_channel_link(
             ctx.guild,
             [
-                int(
-                    os.getenv("ANNOUNCE_CHANNEL_ID", 0)
-                ),  # Asset request announce channel
-                int(os.getenv("CONTRIBUTORS_REQUEST_CHANNEL_ID", 0)),
+                config.get_int("ANNOUNCE_CHANNEL_ID"),  # Asset request announce channel
+                config.get_int("CONTRIBUTORS_REQUEST_CHANNEL_ID"),
             ],
             game_info["channel_id"],
         )
@@ -351,16 +306,16 @@ class Game(commands.Cog):
 
     @group.command(description="Request game testing for your latest build")
     async def test(self, ctx: discord.ApplicationContext, instructions: str = ""):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
             return
 
-        if ctx.author.name != game_info["owner"] and not Game.is_contributor(
+        if ctx.author.name != game_info["owner"] and not await Game.is_contributor(
             ctx, game_info
         ):
             await ctx.respond(
@@ -371,7 +326,7 @@ class Game(commands.Cog):
 
         await ctx.defer(ephemeral=True)
 
-        request_channel = ctx.guild.get_channel(QA_CHANNEL_ID)
+        request_channel = ctx.guild.get_channel(config.get_int("QA_CHANNEL_ID"))
         if not request_channel:
             await ctx.respond("Request channel not found.", ephemeral=True)
             return
@@ -414,17 +369,17 @@ class Game(commands.Cog):
         description="List all contributors to this game along with their itch.io links (if provided)"
     )
     async def listcontributorsitchio(self, ctx: discord.ApplicationContext):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
             return
 
         # respond with a list of contributors and their itch.io links
-        contributors = Database.execute(
+        contributors = await Database.aexecute(
             Database.GAMES_DB,
             """
             SELECT c.discord_display_name, c.itch_io_link
@@ -448,10 +403,10 @@ class Game(commands.Cog):
 
     @group.command(description="Set new game owner")
     async def setowner(self, ctx: discord.ApplicationContext, user: discord.User):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
@@ -467,17 +422,13 @@ class Game(commands.Cog):
             )
             return
 
-        # Update the game owner in the database using helper to ensure proper DB handling
-        Database.update_field(
-            Database.GAMES_DB, "games", game_info["id"], "owner", user.name
-        )
-        # Also update the display name so UIs show the correct owner display name
-        Database.update_field(
+        # Update the owner and the display name shown in UIs together
+        await Database.aupdate_fields(
             Database.GAMES_DB,
             "games",
             game_info["id"],
-            "owner_display_name",
-            getattr(user, "display_name", user.name),
+            owner=user.name,
+            owner_display_name=getattr(user, "display_name", user.name),
         )
 
         await ctx.respond(
@@ -486,10 +437,10 @@ class Game(commands.Cog):
 
     @group.command(description="Set the link to the Game Design Document")
     async def setgddlink(self, ctx: discord.ApplicationContext, link: str):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
         if not game_info:
             await ctx.respond("No game associated with this channel.", ephemeral=True)
@@ -518,7 +469,7 @@ class Game(commands.Cog):
             link = link.split("/edit")[0] + "/view"
 
         # Update the GDD link in the database using helper to ensure proper DB handling
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB, "games", game_info["id"], "gdd_link", link
         )
 
@@ -538,10 +489,10 @@ class Game(commands.Cog):
 
     @staticmethod
     async def set_release_state(ctx: discord.ApplicationContext, state: GameState):
-        game_info = (
-            Database.get_default_game_info()
+        game_info = await (
+            Database.aget_default_game_info()
             if Utils.is_test_environment()
-            else Database.get_game_info(ctx.channel.id)
+            else Database.aget_game_info(ctx.channel.id)
         )
 
         if not game_info:
@@ -556,7 +507,7 @@ class Game(commands.Cog):
             return
 
         # Update the game state in the database using helper to ensure proper DB handling
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB, "games", game_info["id"], "state", state.value
         )
 
@@ -603,7 +554,7 @@ class Game(commands.Cog):
                 inline=False,
             )
 
-        rows = Game.fetch_contributors(game_info, "discord_display_name")
+        rows = await Game.fetch_contributors(game_info, "discord_display_name")
         if rows:
             contributors_str = "\n".join(f"**{name}** — {role}" for name, role in rows)
         else:
@@ -616,13 +567,13 @@ class Game(commands.Cog):
     @staticmethod
     def get_channel_id(game_info: dict) -> int:
         if Utils.is_test_environment():
-            return TEST_CHANNEL_ID
+            return config.get_int("TEST_CHANNEL_ID")
         else:
             return game_info["channel_id"]
 
     @staticmethod
-    def fetch_contributors(game_info: dict, name="credit_name"):
-        return Database.execute(
+    async def fetch_contributors(game_info: dict, name="credit_name"):
+        return await Database.aexecute(
             Database.GAMES_DB,
             f"""
             SELECT c.{name}, gc.role
@@ -634,17 +585,12 @@ class Game(commands.Cog):
         )
 
     @staticmethod
-    def is_contributor(ctx: discord.ApplicationContext, game_info: dict) -> bool:
-        contributor = Database.fetch_one_as_dict(
-            Database.GAMES_DB,
-            "contributors",
-            "discord_username = ?",
-            (ctx.author.name,),
-        )
+    async def is_contributor(ctx: discord.ApplicationContext, game_info: dict) -> bool:
+        contributor = await Database.aget_contributor(ctx.author.name)
         if not contributor:
             return False
 
-        role = Database.fetch_one_as_dict(
+        role = await Database.afetch_one_as_dict(
             Database.GAMES_DB,
             "game_contributors",
             "game_id = ? AND contributor_id = ?",
@@ -658,11 +604,11 @@ class Game(commands.Cog):
         buffer = ""
         field_name = "Games"
 
-        for game in games:
-            github_link = GithubWrapper.GITHUB_URL_PREFIX + game.get("repo_name")
-            itchio_link = game.get("itch_io_link")
-            channel_id = game.get("channel_id")
-            gameid = f"{(game.get('id')):02}"
+        async for game in games:
+            github_link = GithubWrapper.GITHUB_URL_PREFIX + game.repo_name
+            itchio_link = game.itch_io_link
+            channel_id = game.channel_id
+            gameid = f"{game.id:02}"
 
             line = f"`{gameid}` "
             line += f"[GitHub]({github_link}) | "
@@ -718,10 +664,11 @@ class DescriptionModal(Modal):
         self.add_item(self.description_input)
 
     async def callback(self, interaction: Interaction):
+        Database.set_actor(interaction.user)
         print("Description Modal submitted")
         new_description = self.description_input.value
 
-        Database.update_field(
+        await Database.aupdate_field(
             Database.GAMES_DB, "games", self.game_id, "description", new_description
         )
 
@@ -46,12 +46,7 @@ class GameChannel(commands.Cog):
                 return
 
             if not ctx.author.guild_permissions.manage_guild:
-                contributor = Database.fetch_one_as_dict(
-                    Database.GAMES_DB,
-                    "contributors",
-                    "discord_username = ?",
-                    (str(ctx.author.name),),
-                )
+                contributor = await Database.aget_contributor(str(ctx.author.name))
 
                 if not contributor:
                     await ctx.channel.send(
@@ -80,11 +75,7 @@ class GameChannel(commands.Cog):
         repo_name_sanitized = sanitize_repo_name(game_name)
 
         # check if it exists
-        existing = None
-        for repo in GithubWrapper.get_github_org().get_repos():
-            if repo.name.lower() == repo_name_sanitized.lower():
-                existing = repo
-                break
+        existing = await GithubWrapper.afind_org_repo(repo_name_sanitized)
         repo = None
 
         if existing:
@@ -97,14 +88,10 @@ class GameChannel(commands.Cog):
         elif is_thread:
             url = ""
             if not Utils.is_test_environment():
-                repo = GithubWrapper.get_github_org().create_repo_from_template(
-                    repo=GithubWrapper.get_github().get_repo(
-                        "100-Devs-1-Game/MinimalProjectTemplate"
-                    ),
+                repo = await GithubWrapper.acreate_repo_from_template(
+                    "100-Devs-1-Game/MinimalProjectTemplate",
                     name=repo_name_sanitized,
                     description=f"Repository for the game {game_name}",
-                    private=False,
-                    include_all_branches=False,
                 )
                 url = repo.html_url
 
@@ -125,7 +112,9 @@ class GameChannel(commands.Cog):
             new_channel = ctx.channel
             owner = ctx.author
 
-        Database.add_game(game_name, repo.name if repo else "", new_channel.id, owner)
+        await Database.aadd_game(
+            game_name, repo.name if repo else "", new_channel.id, owner
+        )
 
         if not is_thread:
             await ctx.followup.send("Game created in DB", ephemeral=True)
@@ -1,46 +1,244 @@
-import os
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
 from pathlib import Path
+from typing import NamedTuple
 
-from dotenv import load_dotenv
-from github import Auth, Github
+import config
+from metrics import timed
 
-load_dotenv()
+# downloaded private key of the GitHub App
+PRIVATE_KEY_PATH = Path("100devs-discord-bot.2025-08-26.private-key.pem")
+ORG_NAME = "100-Devs-1-Game"
 
-# GitHub App credentials
-GITHUB_APP_ID = os.getenv("GITHUB_APP_ID")  # GitHub App ID
-PRIVATE_KEY_PATH = Path(
-    "100devs-discord-bot.2025-08-26.private-key.pem"  # downloaded private key
-)
-GITHUB_INSTALLATION_ID = os.getenv(
-    "GITHUB_INSTALLATION_ID"
-)  # App installation ID for the repo/org
+# GitHub calls that can run at once, more wait for a free thread
+MAX_WORKERS = 4
+# seconds before a single GitHub request gives up
+REQUEST_TIMEOUT = 15
 
-assert GITHUB_APP_ID
-assert GITHUB_INSTALLATION_ID
+log = logging.getLogger("github")
+
+
+class RepoInfo(NamedTuple):
+    name: str
+    html_url: str
+
+
+class OrgRepoIndex:
+    """
+    Case-insensitive index of the org's repository names, so checking whether a
+    name is taken doesn't page through every repository.
+    - Built once by listing all repositories, newest first.
+    - Before every lookup the first page is asked for again with the ETag of
+      the last answer. GitHub answers 304 Not Modified, which doesn't count
+      against the rate limit, until a repository is created; then the new ones
+      are on that page.
+    - Names missing from the index are free. Names in it are confirmed with one
+      direct repository lookup, which drops deleted and renamed repositories.
+    A repository renamed to a free name outside the bot isn't seen until the
+    next start, creating it then fails on GitHub's side.
+    """
+
+    PER_PAGE = 100
+
+    def __init__(self):
+        self._repos: dict[str, RepoInfo] = {}
+        self._etag: str | None = None
+        self._built = False
+        self._lock = threading.Lock()
+
+    def _page(
+        self, page: int, etag: str | None = None
+    ) -> tuple[str | None, list | None]:
+        """One page of the org's repositories, newest first, and its ETag. None when not modified."""
+        headers, data = GithubWrapper.get_github().requester.requestJsonAndCheck(
+            "GET",
+            f"/orgs/{ORG_NAME}/repos",
+            parameters={
+                "type": "all",
+                "sort": "created",
+                "direction": "desc",
+                "per_page": self.PER_PAGE,
+                "page": page,
+            },
+            headers={"If-None-Match": etag} if etag else None,
+        )
+        return headers.get("etag"), data
+
+    def _add(self, repos: list[dict]):
+        for repo in repos:
+            self._repos[repo["name"].lower()] = RepoInfo(repo["name"], repo["html_url"])
+
+    def _rebuild(self):
+        self._repos.clear()
+        page = 1
+        while True:
+            etag, repos = self._page(page)
+            if page == 1:
+                self._etag = etag
+            self._add(repos)
+            if len(repos) < self.PER_PAGE:
+                break
+            page += 1
+
+        self._built = True
+        log.info(
+            f"Indexed {len(self._repos)} repositories of {ORG_NAME} ({page} pages)"
+        )
+
+    def _refresh(self):
+        etag, repos = self._page(1, self._etag)
+        if repos is None:
+            return
+
+        if repos and all(repo["name"].lower() not in self._repos for repo in repos):
+            # more new repositories than fit on one page
+            self._rebuild()
+            return
+        self._etag = etag
+        self._add(repos)
+
+    @staticmethod
+    def _lookup(name: str) -> RepoInfo | None:
+        from github import UnknownObjectException
+
+        try:
+            repo = GithubWrapper.get_github().get_repo(f"{ORG_NAME}/{name}")
+        except UnknownObjectException:
+            return None
+        # GitHub redirects the old names of renamed repositories, those are free
+        if repo.name.lower() != name.lower():
+            return None
+        return RepoInfo(repo.name, repo.html_url)
+
+    def find(self, name: str) -> RepoInfo | None:
+        """The org's repository called `name`, ignoring case, or None."""
+        with self._lock:
+            if self._built:
+                self._refresh()
+            else:
+                self._rebuild()
+
+            if name.lower() not in self._repos:
+                return None
+
+        info = self._lookup(name)
+        with self._lock:
+            if info is None:
+                # deleted or renamed since it was indexed
+                self._repos.pop(name.lower(), None)
+            else:
+                self._repos[name.lower()] = info
+        return info
+
+    def add(self, info: RepoInfo):
+        with self._lock:
+            self._repos[info.name.lower()] = info
+
+
+class ReleaseTags:
+    """
+    Hands out the release tags of the day per repository: vYYYY.MM.DD, then
+    vYYYY.MM.DD-1, vYYYY.MM.DD-2, ...
+    The tags already made today are looked up once per repository and day, only
+    those whose name starts with today's tag. After that the suffix comes from
+    an in-memory counter. Reserving is atomic, so concurrent builds of one game
+    never get the same tag.
+    """
+
+    def __init__(self):
+        # repository full name -> (today's base tag, next suffix), suffix 0 is no suffix
+        self._next: dict[str, tuple[str, int]] = {}
+        # one lock per repository, so a slow lookup only holds up that repository
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+
+    def _repo_lock(self, repo) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(repo.full_name, threading.Lock())
+
+    @staticmethod
+    def _next_suffix(repo, base_tag: str) -> int:
+        refs = repo.get_git_matching_refs(f"tags/{base_tag}")
+        tags = [ref.ref.removeprefix("refs/tags/") for ref in refs]
+
+        counters = []
+        for tag in tags:
+            if tag == base_tag:
+                counters.append(0)
+            elif tag.startswith(f"{base_tag}-") and tag[len(base_tag) + 1 :].isdigit():
+                counters.append(int(tag[len(base_tag) + 1 :]))
+        return max(counters) + 1 if counters else 0
+
+    def reserve(self, repo) -> str:
+        """The next free release tag of today for `repo`, never handed out twice."""
+        base_tag = datetime.now(timezone.utc).strftime("v%Y.%m.%d")
+        with self._repo_lock(repo):
+            day, suffix = self._next.get(repo.full_name, (None, 0))
+            if day != base_tag:
+                suffix = self._next_suffix(repo, base_tag)
+            self._next[repo.full_name] = (base_tag, suffix + 1)
+
+        return f"{base_tag}-{suffix}" if suffix else base_tag
+
+    def forget(self, repo):
+        """Look the tags of `repo` up again on the next reservation, e.g. after a clash."""
+        with self._repo_lock(repo):
+            self._next.pop(repo.full_name, None)
 
 
 class GithubWrapper:
-    GITHUB_URL_PREFIX = "https://github.com/100-Devs-1-Game/"
+    """
+    The bot's one GitHub client, authenticated as the GitHub App installation.
+    PyGithub is blocking, so from the event loop use the async helpers (or
+    `arun`), which run the calls on a small pool of GitHub threads. The
+    client is shared by all threads: one HTTP connection pool, one
+    installation token that PyGithub refreshes shortly before it expires.
+    """
+
+    GITHUB_URL_PREFIX = f"https://github.com/{ORG_NAME}/"
 
     _instance = None
+    _lock = threading.Lock()
+    repo_index = OrgRepoIndex()
+    release_tags = ReleaseTags()
+    _executor = ThreadPoolExecutor(max_workers=MAX_WORKERS, thread_name_prefix="github")
 
     @staticmethod
     def get_instance():
-        if GithubWrapper._instance is None:
-            GithubWrapper()
+        # the first calls can come from several GitHub threads at once
+        with GithubWrapper._lock:
+            if GithubWrapper._instance is None:
+                GithubWrapper()
         return GithubWrapper._instance
 
     def __init__(self):
         if GithubWrapper._instance is not None:
             raise Exception("This class is a singleton!")
-        else:
-            GithubWrapper._instance = self
 
-            appauth = Auth.AppAuth(GITHUB_APP_ID, PRIVATE_KEY_PATH.read_text())
-            installauth = appauth.get_installation_auth(int(GITHUB_INSTALLATION_ID))
+        # PyGithub and jwt take a while to import, only pay for them on first use
+        from github import Auth, Github
+
+        # GitHub App credentials
+        app_id = config.get("GITHUB_APP_ID")  # GitHub App ID
+        installation_id = config.get(
+            "GITHUB_INSTALLATION_ID"
+        )  # App installation ID for the repo/org
+        assert app_id
+        assert installation_id
 
-            self.github = Github(auth=installauth)
-            self.github_org = self.github.get_organization("100-Devs-1-Game")
+        appauth = Auth.AppAuth(app_id, PRIVATE_KEY_PATH.read_text())
+        installauth = appauth.get_installation_auth(int(installation_id))
+
+        self.github = Github(
+            auth=installauth, pool_size=MAX_WORKERS, timeout=REQUEST_TIMEOUT
+        )
+        self.github_org = self.github.get_organization(ORG_NAME)
+        GithubWrapper._instance = self
 
     @staticmethod
     def get_github():
@@ -49,3 +247,92 @@ class GithubWrapper:
     @staticmethod
     def get_github_org():
         return GithubWrapper.get_instance().github_org
+
+    @staticmethod
+    def close():
+        GithubWrapper._executor.shutdown(wait=False, cancel_futures=True)
+        if GithubWrapper._instance is not None:
+            GithubWrapper._instance.github.close()
+
+    @staticmethod
+    def _timed_call(func, *args, **kwargs):
+        with timed("github"):
+            return func(*args, **kwargs)
+
+    @staticmethod
+    async def arun(func, *args, **kwargs):
+        """Run a blocking PyGithub call on a GitHub thread and await it."""
+        loop = asyncio.get_running_loop()
+        call = functools.partial(
+            contextvars.copy_context().run,
+            GithubWrapper._timed_call,
+            func,
+            *args,
+            **kwargs,
+        )
+        return await loop.run_in_executor(GithubWrapper._executor, call)
+
+    @staticmethod
+    async def aget_repo(full_name: str):
+        return await GithubWrapper.arun(
+            lambda: GithubWrapper.get_github().get_repo(full_name)
+        )
+
+    @staticmethod
+    async def acreate_issue(full_name: str, title: str, body: str = ""):
+        return await GithubWrapper.arun(
+            lambda: (
+                GithubWrapper.get_github().get_repo(full_name).create_issue(title, body)
+            )
+        )
+
+    @staticmethod
+    def find_org_repo(name: str) -> RepoInfo | None:
+        """The org's repository called `name`, ignoring case, or None."""
+        return GithubWrapper.repo_index.find(name)
+
+    @staticmethod
+    async def afind_org_repo(name: str) -> RepoInfo | None:
+        return await GithubWrapper.arun(GithubWrapper.find_org_repo, name)
+
+    @staticmethod
+    def create_repo_from_template(template: str, name: str, description: str):
+        repo = GithubWrapper.get_github_org().create_repo_from_template(
+            repo=GithubWrapper.get_github().get_repo(template),
+            name=name,
+            description=description,
+            private=False,
+            include_all_branches=False,
+        )
+        GithubWrapper.repo_index.add(RepoInfo(repo.name, repo.html_url))
+        return repo
+
+    @staticmethod
+    def create_release_tag(repo, sha: str) -> str:
+        """Tag `sha` with the next release tag of the day and return the tag."""
+        from github import GithubException
+
+        for attempt in range(2):
+            new_tag = GithubWrapper.release_tags.reserve(repo)
+            # create tag object + ref
+            tag = repo.create_git_tag(
+                tag=new_tag, message=f"Release {new_tag}", object=sha, type="commit"
+            )
+            try:
+                repo.create_git_ref(ref=f"refs/tags/{new_tag}", sha=tag.sha)
+                return new_tag
+            except GithubException as e:
+                # 422: the tag exists, made outside the bot since we looked
+                if e.status != 422 or attempt > 0:
+                    raise
+                GithubWrapper.release_tags.forget(repo)
+
+    @staticmethod
+    async def acreate_release_tag(repo, sha: str) -> str:
+        return await GithubWrapper.arun(GithubWrapper.create_release_tag, repo, sha)
+
+    @staticmethod
+    async def acreate_repo_from_template(template: str, name: str, description: str):
+        return await GithubWrapper.arun(
+            GithubWrapper.create_repo_from_template, template, name, description
+        )
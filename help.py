@@ -29,6 +29,7 @@ COMMANDS = [
     "/game test",
     "/game updatereleasedate",
     "/onboarding test",
+    "/search",
 ]
 
 
@@ -0,0 +1,68 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# import time:      self [us] | cumulative | imported package
+LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|\s+(\S+)")
+
+
+def measure(module: str) -> list[tuple[str, int, int]]:
+    """
+    Import `module` in a fresh interpreter with -X importtime.
+    Returns (name, self us, cumulative us) for every module imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        # the traceback comes after the importtime lines
+        raise RuntimeError(
+            f"Importing {module} failed:\n{result.stderr.splitlines()[-1]}"
+        )
+
+    entries = []
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, name = match.groups()
+            entries.append((name, int(self_us), int(cumulative_us)))
+    return entries
+
+
+def budget(entries: list[tuple[str, int, int]]) -> dict[str, int]:
+    """Add up the self time of every module per top-level package, in microseconds."""
+    totals: dict[str, int] = {}
+    for name, self_us, _ in entries:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Show how long importing the bot takes, per package"
+    )
+    parser.add_argument("module", nargs="?", default="discord_bot")
+    parser.add_argument("--top", type=int, default=20, help="packages to list")
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        help="exit with an error when the whole import takes longer than this",
+    )
+    args = parser.parse_args()
+
+    entries = measure(args.module)
+    totals = budget(entries)
+    total_us = sum(totals.values())
+
+    print(f"{'package':<30} {'ms':>8} {'share':>6}")
+    for package, self_us in sorted(totals.items(), key=lambda x: -x[1])[: args.top]:
+        print(f"{package:<30} {self_us / 1000:>8.1f} {self_us / total_us:>6.0%}")
+    print(f"{'total':<30} {total_us / 1000:>8.1f}")
+
+    if args.budget_ms is not None and total_us / 1000 > args.budget_ms:
+        print(f"Over the budget of {args.budget_ms} ms", file=sys.stderr)
+        sys.exit(1)
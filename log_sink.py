@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from typing import Callable
+
+import discord
+
+MAX_MESSAGE_LENGTH = 2000  # Discord message limit
+FENCE = "```"
+
+log = logging.getLogger("db.log_sink")
+
+
+def split_entry(entry: str, limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """
+    Split one log entry into pieces of at most `limit` characters.
+    Cuts happen on line boundaries and code blocks are closed and reopened across cuts.
+    """
+    if len(entry) <= limit:
+        return [entry]
+
+    # leave room for closing and reopening a code block around a cut
+    width = limit - 2 * (len(FENCE) + 1)
+    lines = []
+    for line in entry.split("\n"):
+        lines.extend(line[i : i + width] for i in range(0, max(len(line), 1), width))
+
+    pieces = []
+    current = ""
+    in_fence = False
+    for line in lines:
+        candidate = f"{current}\n{line}" if current else line
+        if len(candidate) + len(FENCE) + 1 > limit:
+            pieces.append(current + (f"\n{FENCE}" if in_fence else ""))
+            current = (f"{FENCE}\n" if in_fence else "") + line
+        else:
+            current = candidate
+
+        if line.startswith(FENCE):
+            in_fence = not in_fence
+
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def pack_entries(entries: list[str], limit: int = MAX_MESSAGE_LENGTH) -> list[str]:
+    """Pack log entries into as few messages as possible without exceeding `limit`."""
+    messages = []
+    current = ""
+    for entry in entries:
+        for piece in split_entry(entry, limit):
+            if current and len(current) + 1 + len(piece) <= limit:
+                current += "\n" + piece
+            else:
+                if current:
+                    messages.append(current)
+                current = piece
+
+    if current:
+        messages.append(current)
+    return messages
+
+
+class LogSink:
+    """
+    Collects log entries from any thread and posts them to a Discord channel in batches.
+    Entries are coalesced over `window` seconds; once `max_queue` entries are waiting,
+    new ones are dropped and counted instead of growing the queue.
+    """
+
+    MAX_RETRIES = 5
+
+    def __init__(
+        self,
+        get_channel: Callable[[], discord.abc.Messageable | None],
+        window: float = 2.0,
+        max_queue: int = 1000,
+    ):
+        self.get_channel = get_channel
+        self.window = window
+        self.max_queue = max_queue
+
+        self.dropped = 0  # entries rejected because the queue was full
+        self.failed = 0  # messages that could not be sent
+        self.sent = 0  # messages posted
+        self.batched = 0  # entries packed into messages
+        self.rate_limited = 0  # sends Discord answered with 429 Too Many Requests
+
+        self._entries: deque[str] = deque()
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+        self._stopping: asyncio.Event | None = None
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        return {
+            "queue_depth": self.queue_depth,
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "sent": self.sent,
+            "batched": self.batched,
+            "rate_limited": self.rate_limited,
+        }
+
+    def submit(self, entry: str) -> bool:
+        """Queue an entry, safe to call from any thread."""
+        with self._lock:
+            if len(self._entries) >= self.max_queue:
+                self.dropped += 1
+                return False
+
+            self._entries.append(entry)
+            return True
+
+    def start(self):
+        """Start the background flush task, must be called from the running event loop."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="db-log-sink")
+
+    async def close(self):
+        """Stop the background task and flush whatever is still queued."""
+        if self._task is not None and not self._task.done():
+            self._stopping.set()
+            await self._task
+        else:
+            await self.flush()
+
+    async def _run(self):
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), timeout=self.window)
+            except asyncio.TimeoutError:
+                pass
+
+            try:
+                await self.flush()
+            except Exception as e:
+                log.exception(f"Failed to flush db log entries: {e}")
+
+    async def flush(self):
+        with self._lock:
+            entries = list(self._entries)
+            self._entries.clear()
+
+        if not entries:
+            return
+
+        channel = self.get_channel()
+        if channel is None:
+            log.warning(
+                f"Db log channel not available, {len(entries)} entries not posted"
+            )
+            self.failed += 1
+            return
+
+        self.batched += len(entries)
+        for message in pack_entries(entries):
+            await self._send(channel, message)
+
+    async def _send(self, channel: discord.abc.Messageable, message: str):
+        for attempt in range(self.MAX_RETRIES):
+            try:
+                await channel.send(message)
+                self.sent += 1
+                return
+            except discord.HTTPException as e:
+                if e.status != 429:
+                    log.warning(f"Failed to post db log message: {e}")
+                    break
+
+                self.rate_limited += 1
+                retry_after = e.response.headers.get("Retry-After")
+                await asyncio.sleep(float(retry_after) if retry_after else 2**attempt)
+
+        self.failed += 1
@@ -0,0 +1,172 @@
+import asyncio
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+from metrics import LAG_BUCKETS_MS, metrics
+from query_log import LatencyStats
+
+log = logging.getLogger("loop.watchdog")
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+# stack frames shown per report, innermost last
+REPORT_FRAMES = 12
+
+
+class LoopWatchdog:
+    """
+    Finds synchronous calls that hold up the event loop.
+    - A heartbeat task wakes up every `interval` seconds, records how late it
+      woke up in the event loop lag histogram, and stamps the time.
+    - A sampling thread checks the stamp. Once it is older than `threshold`
+      seconds the loop is stuck in one callback, so the thread samples the loop
+      thread's stack every `interval` until the heartbeat comes back.
+    - The block is then logged to "loop.watchdog" with its most common stack,
+      and counted per command and coroutine for /admin blockers.
+    """
+
+    def __init__(self, threshold: float = 0.25, interval: float = 0.05):
+        self.threshold = threshold
+        self.interval = interval
+        # (command, coroutine) -> how long and how often they blocked the loop
+        self.blockers: dict[tuple[str, str], LatencyStats] = {}
+
+        self._lock = threading.Lock()
+        self._beat = time.monotonic()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread: int | None = None
+        self._task: asyncio.Task | None = None
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self):
+        """Start watching the running event loop, must be called from it."""
+        if self._task is not None and not self._task.done():
+            return
+
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._beat = time.monotonic()
+        self._task = asyncio.create_task(self._heartbeat(), name="loop-heartbeat")
+
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._watch, name="loop-watchdog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+        self._stop.set()
+
+    def top(self, n: int = 10) -> list[tuple[tuple[str, str], LatencyStats]]:
+        """The `n` command and coroutine pairs that blocked the loop the longest in total."""
+        with self._lock:
+            items = list(self.blockers.items())
+        return sorted(items, key=lambda item: item[1].total, reverse=True)[:n]
+
+    def reset(self):
+        with self._lock:
+            self.blockers.clear()
+
+    async def _heartbeat(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            lag = loop.time() - start - self.interval
+            metrics.loop_lag.add(max(lag, 0.0) * 1000)
+            self._beat = time.monotonic()
+
+    def _watch(self):
+        stuck_beat = None
+        samples: Counter[tuple] = Counter()
+        coroutine = command = None
+
+        while not self._stop.wait(self.interval):
+            beat = self._beat
+            if stuck_beat is not None and beat != stuck_beat:
+                # the heartbeat came back, the loop is free again
+                blocked = beat - stuck_beat - self.interval
+                self._report(blocked, samples, coroutine, command)
+                stuck_beat = None
+                samples.clear()
+                continue
+
+            if time.monotonic() - beat - self.interval < self.threshold:
+                continue
+
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            stack, frame_coroutine = _sample(frame)
+            samples[stack] += 1
+            if stuck_beat is None:
+                stuck_beat = beat
+                coroutine = frame_coroutine
+                command = self._running_command()
+
+    def _running_command(self) -> str | None:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            return None
+        return metrics.running.get(task) if task is not None else None
+
+    def _report(self, blocked: float, samples: Counter, coroutine, command):
+        coroutine = coroutine or "(not in a coroutine)"
+        command = command or "-"
+        with self._lock:
+            stats = self.blockers.get((command, coroutine))
+            if stats is None:
+                stats = self.blockers[(command, coroutine)] = LatencyStats(
+                    LAG_BUCKETS_MS
+                )
+            stats.add(blocked * 1000)
+
+        stack, seen = samples.most_common(1)[0]
+        log.warning(
+            "Event loop blocked for %.0f ms in %s (command: %s), stack in %d of %d samples:\n%s",
+            blocked * 1000,
+            coroutine,
+            command,
+            seen,
+            sum(samples.values()),
+            "\n".join(stack[-REPORT_FRAMES:]),
+        )
+
+
+def _sample(frame) -> tuple[tuple[str, ...], str | None]:
+    """
+    The stack of `frame` as "file:line in function" lines, outermost first, and
+    the innermost coroutine on it, preferring one from this repo.
+    """
+    stack = []
+    coroutine = repo_coroutine = None
+    while frame is not None:
+        code = frame.f_code
+        stack.append(
+            f"{_short_path(code.co_filename)}:{frame.f_lineno} in {code.co_qualname}"
+        )
+        if code.co_flags & inspect.CO_COROUTINE:
+            coroutine = coroutine or code.co_qualname
+            if repo_coroutine is None and code.co_filename.startswith(REPO_DIR):
+                repo_coroutine = code.co_qualname
+        frame = frame.f_back
+    return tuple(reversed(stack)), repo_coroutine or coroutine
+
+
+def _short_path(path: str) -> str:
+    if path.startswith(REPO_DIR):
+        return os.path.relpath(path, REPO_DIR)
+    # library code, e.g. github/Requester.py
+    _, site, rest = path.partition("site-packages" + os.sep)
+    return rest if site else os.path.basename(path)
+
+
+loop_watchdog = LoopWatchdog()
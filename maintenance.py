@@ -0,0 +1,158 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+
+from audit import compact_audit_log
+from databases import Database
+
+log = logging.getLogger("db.maintenance")
+
+AUTO_VACUUM_INCREMENTAL = 2
+# holds the unix time of the last finished maintenance, so restarts keep the schedule
+LAST_RUN_PATH = "dbs/maintenance.last"
+# seconds after startup before an overdue maintenance runs, lets the bot finish connecting
+STARTUP_DELAY = 5 * 60
+
+
+def pragma(conn: sqlite3.Connection, name: str):
+    return conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+
+def maintain(db_path: str) -> str:
+    """
+    Tidy one database file: reclaim free pages, refresh the planner statistics,
+    checkpoint the WAL and run a quick integrity check.
+    Returns a summary for the db log channel.
+    """
+    timings = []
+
+    def step(name, func):
+        start = time.perf_counter()
+        result = func()
+        timings.append(f"{name} {(time.perf_counter() - start) * 1000:.0f} ms")
+        return result
+
+    with Database.connect(db_path) as conn:
+        pages_before = pragma(conn, "page_count")
+        free_before = pragma(conn, "freelist_count")
+
+        if pragma(conn, "auto_vacuum") != AUTO_VACUUM_INCREMENTAL:
+            # only takes effect on existing files after one full VACUUM
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            step("vacuum", lambda: conn.execute("VACUUM"))
+        else:
+            step(
+                "incremental_vacuum",
+                lambda: conn.execute("PRAGMA incremental_vacuum").fetchall(),
+            )
+
+        # ANALYZE once to give optimize something to work from, after that
+        # optimize only re-analyzes tables whose statistics went stale
+        has_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+        ).fetchone()
+        if has_stats:
+            step("optimize", lambda: conn.execute("PRAGMA optimize").fetchall())
+        else:
+            step("analyze", lambda: conn.execute("ANALYZE"))
+        if conn.in_transaction:
+            conn.commit()
+
+        wal_path = f"{db_path}-wal"
+        wal_before = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+        busy, _, _ = step(
+            "checkpoint",
+            lambda: conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone(),
+        )
+        problems = step(
+            "quick_check", lambda: conn.execute("PRAGMA quick_check").fetchall()
+        )
+
+        pages_after = pragma(conn, "page_count")
+        free_after = pragma(conn, "freelist_count")
+
+    status = "ok" if problems == [("ok",)] else "\n".join(row[0] for row in problems)
+    return (
+        f"**Maintenance of `{db_path}`**\n```\n"
+        f"    pages: {pages_before} -> {pages_after} (free {free_before} -> {free_after})\n"
+        f"    wal: {wal_before // 1024} KiB, {'checkpoint blocked by a reader' if busy else 'checkpointed and truncated'}\n"
+        f"    quick_check: {status}\n"
+        f"    {', '.join(timings)}\n```"
+    )
+
+
+class MaintenanceJob:
+    """
+    Archives old audit entries, then runs `maintain` on every database file
+    each `interval` seconds.
+    The work runs on the database thread, so it never blocks the event loop
+    and never overlaps with other queries on the same connection.
+    The time of the last run is kept in `last_run_path`, the first run after
+    startup is due `interval` seconds after it.
+    """
+
+    def __init__(
+        self, interval: float = 24 * 60 * 60, last_run_path: str = LAST_RUN_PATH
+    ):
+        self.interval = interval
+        self.last_run_path = last_run_path
+        self._task: asyncio.Task | None = None
+
+    def last_run(self) -> float | None:
+        try:
+            with open(self.last_run_path) as f:
+                return float(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def first_delay(self) -> float:
+        """Seconds until the first maintenance after startup."""
+        last = self.last_run()
+        due = 0.0 if last is None else last + self.interval - time.time()
+        return max(due, STARTUP_DELAY)
+
+    def run(self) -> list[str]:
+        reports = []
+
+        # before maintaining, so the vacuum gives back the archived entries' pages
+        archive_path, count = compact_audit_log()
+        if archive_path is not None:
+            report = f"Archived {count} audit entries to `{archive_path}`"
+            Database._log(report)
+            reports.append(report)
+
+        for db_path in Database.db_paths():
+            report = maintain(db_path)
+            Database._log(report)
+            reports.append(report)
+
+        with open(self.last_run_path, "w") as f:
+            f.write(str(int(time.time())))
+        return reports
+
+    async def arun(self) -> list[str]:
+        return await Database.arun(self.run)
+
+    def start(self):
+        """Start the periodic maintenance, must be called from the running event loop."""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._loop(), name="db-maintenance")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _loop(self):
+        delay = self.first_delay()
+        while True:
+            await asyncio.sleep(delay)
+            delay = self.interval
+            try:
+                await self.arun()
+            except Exception as e:
+                log.exception(f"Scheduled maintenance failed: {e}")
+
+
+maintenance_job = MaintenanceJob()
@@ -0,0 +1,305 @@
+import asyncio
+import contextvars
+import logging
+import math
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+
+import discord
+
+import config
+from query_log import LatencyStats
+
+log = logging.getLogger("metrics")
+
+# Discord fails an interaction that isn't answered within 3 seconds
+RESPONSE_DEADLINE_MS = 3000
+# upper bounds of the command histogram buckets, in milliseconds
+COMMAND_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2000, 3000, 5000, 10000, 30000)
+# upper bounds of the event loop lag histogram buckets, in milliseconds
+LAG_BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 5000)
+DEFAULT_PORT = 9108
+
+
+class CommandTiming:
+    """The timings of one running command, filled in while it runs."""
+
+    __slots__ = ("name", "start", "first_response", "db", "github")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.start = time.perf_counter()
+        self.first_response: float | None = None
+        self.db = 0.0
+        self.github = 0.0
+
+
+# the command the current task (or database call made for it) is running for
+current: contextvars.ContextVar[CommandTiming | None] = contextvars.ContextVar(
+    "command_timing", default=None
+)
+
+
+def add_time(kind: str, elapsed: float):
+    """Count `elapsed` seconds of "db" or "github" time towards the running command."""
+    timing = current.get()
+    if timing is not None:
+        setattr(timing, kind, getattr(timing, kind) + elapsed)
+
+
+@contextmanager
+def timed(kind: str):
+    """Count the time spent in the block as "db" or "github" time of the running command."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_time(kind, time.perf_counter() - start)
+
+
+class CommandStats:
+    __slots__ = ("first_response", "duration", "db", "github", "errors", "late")
+
+    def __init__(self):
+        self.first_response = LatencyStats(COMMAND_BUCKETS_MS)
+        self.duration = LatencyStats(COMMAND_BUCKETS_MS)
+        self.db = LatencyStats(COMMAND_BUCKETS_MS)
+        self.github = LatencyStats(COMMAND_BUCKETS_MS)
+        self.errors = 0
+        # answered after the deadline, or not at all
+        self.late = 0
+
+
+class TimedContext(discord.ApplicationContext):
+    """ApplicationContext that notes when the command first answered its interaction."""
+
+    async def respond(self, *args, **kwargs):
+        result = await super().respond(*args, **kwargs)
+        metrics.responded()
+        return result
+
+    async def defer(self, *args, **kwargs):
+        result = await super().defer(*args, **kwargs)
+        metrics.responded()
+        return result
+
+    async def send_modal(self, *args, **kwargs):
+        result = await super().send_modal(*args, **kwargs)
+        metrics.responded()
+        return result
+
+
+class Metrics:
+    """
+    Per-command timings, gateway latency and event loop lag, served in the
+    Prometheus text format on http://127.0.0.1:<METRICS_PORT>/metrics.
+    For every command it keeps histograms of:
+    - the time until the interaction was first answered (respond, defer or modal)
+    - the total handler time
+    - the time spent in database statements and in GitHub calls
+    and counts its errors and the answers that missed Discord's 3 second deadline.
+    """
+
+    def __init__(self):
+        self.commands: dict[str, CommandStats] = {}
+        # filled in by the loop watchdog
+        self.loop_lag = LatencyStats(LAG_BUCKETS_MS)
+        # the task of each running command -> its name
+        self.running: dict[asyncio.Task, str] = {}
+        self.bot: discord.Bot | None = None
+        # (name, help text, stats function, counter keys), see add_stats
+        self.stats_sources: list[tuple[str, str, Callable[[], dict], tuple]] = []
+        self._lock = threading.Lock()
+        self._task: asyncio.Task | None = None
+
+    def _stats(self, command: str) -> CommandStats:
+        with self._lock:
+            stats = self.commands.get(command)
+            if stats is None:
+                stats = self.commands[command] = CommandStats()
+            return stats
+
+    @contextmanager
+    def command(self, name: str):
+        """
+        Time one command invocation, run its handler inside the block.
+        The stats are kept under the name the command has when the block exits,
+        see `set_command`.
+        """
+        timing = CommandTiming(name)
+        token = current.set(timing)
+        task = asyncio.current_task()
+        if task is not None:
+            self.running[task] = name
+        try:
+            yield timing
+        finally:
+            current.reset(token)
+            self.running.pop(task, None)
+            duration = time.perf_counter() - timing.start
+
+            stats = self._stats(timing.name)
+            stats.duration.add(duration * 1000)
+            stats.db.add(timing.db * 1000)
+            stats.github.add(timing.github * 1000)
+            if timing.first_response is not None:
+                stats.first_response.add(timing.first_response * 1000)
+            if (
+                timing.first_response is None
+                or timing.first_response * 1000 > RESPONSE_DEADLINE_MS
+            ):
+                stats.late += 1
+
+    def add_stats(
+        self,
+        name: str,
+        help_text: str,
+        stats: Callable[[], dict],
+        counters: tuple[str, ...] = (),
+    ):
+        """
+        Serve each number of `stats()` as bot_<name>_<key>. The keys in
+        `counters` are totals that only go up, the others are gauges.
+        """
+        self.stats_sources.append((name, help_text, stats, counters))
+
+    def set_command(self, name: str):
+        """
+        Rename the running command. Groups are invoked under their own name and
+        only pick the subcommand while running, so "game" becomes "game build".
+        """
+        timing = current.get()
+        if timing is not None:
+            timing.name = name
+        task = asyncio.current_task()
+        if task in self.running:
+            self.running[task] = name
+
+    def responded(self):
+        timing = current.get()
+        if timing is not None and timing.first_response is None:
+            timing.first_response = time.perf_counter() - timing.start
+
+    def error(self, name: str):
+        self._stats(name).errors += 1
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        with self._lock:
+            commands = sorted(self.commands.items())
+
+        lines = []
+        histograms = (
+            ("first_response", "Time until the interaction was first answered"),
+            ("duration", "Total command handler time"),
+            ("db", "Time spent in database statements"),
+            ("github", "Time spent in GitHub API calls"),
+        )
+        for attr, help_text in histograms:
+            name = f"bot_command_{attr}_seconds"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for command, stats in commands:
+                lines += _histogram(
+                    name, getattr(stats, attr), f'command="{_escape(command)}"'
+                )
+
+        counters = (
+            ("errors", "Commands that raised an error"),
+            (
+                "late",
+                "Commands that answered after the 3 second deadline or not at all",
+            ),
+        )
+        for attr, help_text in counters:
+            name = f"bot_command_{attr}_total"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+            for command, stats in commands:
+                lines.append(
+                    f'{name}{{command="{_escape(command)}"}} {getattr(stats, attr)}'
+                )
+
+        for source, help_text, stats, counters in self.stats_sources:
+            for key, value in stats().items():
+                if key in counters:
+                    name, kind = f"bot_{source}_{key}_total", "counter"
+                else:
+                    name, kind = f"bot_{source}_{key}", "gauge"
+                lines += [
+                    f"# HELP {name} {help_text}: {key.replace('_', ' ')}",
+                    f"# TYPE {name} {kind}",
+                    f"{name} {int(value)}",
+                ]
+
+        latency = self.bot.latency if self.bot is not None else math.nan
+        if math.isfinite(latency):
+            lines += [
+                "# HELP bot_gateway_latency_seconds Discord gateway heartbeat latency",
+                "# TYPE bot_gateway_latency_seconds gauge",
+                f"bot_gateway_latency_seconds {latency:.6f}",
+            ]
+
+        lines += [
+            "# HELP bot_event_loop_lag_seconds How late the event loop ran a timer",
+            "# TYPE bot_event_loop_lag_seconds histogram",
+            *_histogram("bot_event_loop_lag_seconds", self.loop_lag),
+        ]
+        return "\n".join(lines) + "\n"
+
+    def start(self, bot: discord.Bot):
+        """Start the endpoint, must be called from the running event loop."""
+        self.bot = bot
+        port = config.get_int("METRICS_PORT", DEFAULT_PORT)
+        if port and (self._task is None or self._task.done()):
+            self._task = asyncio.create_task(self._serve(port), name="metrics")
+
+    def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+    async def _serve(self, port: int):
+        # aiohttp.web is only needed once the bot runs
+        from aiohttp import web
+
+        async def handle(request: web.Request) -> web.Response:
+            return web.Response(text=self.render(), content_type="text/plain")
+
+        app = web.Application()
+        app.router.add_get("/metrics", handle)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        try:
+            # local only, the numbers are for whoever runs the bot
+            await web.TCPSite(runner, "127.0.0.1", port).start()
+            log.info(f"Serving metrics on http://127.0.0.1:{port}/metrics")
+            # serve until stopped
+            await asyncio.Event().wait()
+        except OSError as e:
+            log.error(f"Could not serve metrics on port {port}: {e}")
+        finally:
+            await runner.cleanup()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _histogram(name: str, stats: LatencyStats, labels: str = "") -> list[str]:
+    """Prometheus lines of one histogram, its buckets are cumulative and in seconds."""
+    sep = "," if labels else ""
+    lines = []
+    seen = 0
+    for bound, count in zip(stats.bounds, stats.buckets):
+        seen += count
+        lines.append(f'{name}_bucket{{{labels}{sep}le="{bound / 1000:g}"}} {seen}')
+    suffix = f"{{{labels}}}" if labels else ""
+    lines += [
+        f'{name}_bucket{{{labels}{sep}le="+Inf"}} {stats.count}',
+        f"{name}_sum{suffix} {stats.total / 1000:.6f}",
+        f"{name}_count{suffix} {stats.count}",
+    ]
+    return lines
+
+
+metrics = Metrics()
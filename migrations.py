@@ -0,0 +1,211 @@
+import logging
+import os
+import sqlite3
+
+from databases import Database
+
+log = logging.getLogger("db.migrations")
+
+TABLES = {
+    "games": "id INTEGER PRIMARY KEY, name TEXT, repo_name TEXT, channel_id INTEGER, owner TEXT, owner_display_name TEXT, itch_io_link TEXT",
+    "contributors": "id INTEGER PRIMARY KEY AUTOINCREMENT, discord_username TEXT NOT NULL, discord_display_name TEXT, credit_name TEXT NOT NULL, itch_io_link TEXT, alt_link TEXT",
+    "game_contributors": "game_id INTEGER NOT NULL, contributor_id INTEGER NOT NULL, role TEXT NOT NULL, PRIMARY KEY (game_id, contributor_id, role), FOREIGN KEY (game_id) REFERENCES games(id), FOREIGN KEY (contributor_id) REFERENCES contributors(id)",
+    "asset_requests": "id INTEGER PRIMARY KEY AUTOINCREMENT, game_id INTEGER NOT NULL, asset_type TEXT NOT NULL, content TEXT NOT NULL, context TEXT, requested_by INTEGER NOT NULL, accepted_by INTEGER, status TEXT NOT NULL, FOREIGN KEY (game_id) REFERENCES games(id), FOREIGN KEY (requested_by) REFERENCES contributors(id), FOREIGN KEY (accepted_by) REFERENCES contributors(id)",
+    "tasks": "id INTEGER PRIMARY KEY AUTOINCREMENT, user_id TEXT NOT NULL, description TEXT NOT NULL, deadline TEXT, finished INTEGER DEFAULT 0, event_id INTEGER DEFAULT NULL",
+    "events": "id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL, triggered INTEGER DEFAULT 0",
+    "audit_log": "id INTEGER PRIMARY KEY AUTOINCREMENT, at INTEGER NOT NULL, table_name TEXT NOT NULL, row_id INTEGER, action TEXT NOT NULL, changes TEXT NOT NULL, actor TEXT",
+}
+
+# Fields added after the tables were first created. Older databases may
+# already have some of them, so they are only added when missing.
+NEW_FIELDS = {
+    "contributors": [
+        ("time_zone", "INTEGER DEFAULT NULL"),
+        ("trust_points", "INTEGER DEFAULT 0"),
+        ("trust_remarks", "TEXT DEFAULT NULL"),
+    ],
+    "games": [
+        ("gdd_link", "TEXT DEFAULT NULL"),
+        ("state", "INTEGER DEFAULT 0"),
+        # written by /game setdescription but never part of the original schema
+        ("description", "TEXT DEFAULT NULL"),
+    ],
+}
+
+# Indexes for the hot lookups, name -> (table, columns)
+INDEXES = {
+    "idx_contributors_discord_username": ("contributors", "discord_username"),
+    "idx_games_channel_id": ("games", "channel_id"),
+    # covers the contributor -> games join without touching the table
+    "idx_game_contributors_contributor": (
+        "game_contributors",
+        "contributor_id, game_id, role",
+    ),
+    "idx_asset_requests_type_status": ("asset_requests", "asset_type, status"),
+}
+
+
+def create_tables(*tables):
+    def apply(conn: sqlite3.Connection):
+        for table in tables:
+            conn.execute(f"CREATE TABLE IF NOT EXISTS {table} ({TABLES[table]})")
+
+    return apply
+
+
+def add_new_fields(conn: sqlite3.Connection):
+    for table, new_columns in NEW_FIELDS.items():
+        existing = [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+        for name, coltype in new_columns:
+            if name not in existing:
+                log.info(f"Adding column '{name}' to table '{table}'")
+                conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {coltype}")
+
+
+def create_indexes(conn: sqlite3.Connection):
+    for name, (table, columns) in INDEXES.items():
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+
+
+def import_tasks_and_events(conn: sqlite3.Connection):
+    """
+    Create the tasks and events tables in games.db and copy over the rows of the
+    separate files they used to live in, keeping their ids so task.event_id stays valid.
+    """
+    create_tables("tasks", "events")(conn)
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_tasks_user_id ON tasks (user_id, deadline)"
+    )
+
+    for legacy_path, table in (
+        (Database.LEGACY_TASKS_DB, "tasks"),
+        (Database.LEGACY_EVENTS_DB, "events"),
+    ):
+        if not os.path.exists(legacy_path):
+            continue
+
+        # ATTACH isn't allowed inside the migration's transaction, read it separately
+        legacy = sqlite3.connect(legacy_path)
+        try:
+            if not legacy.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+                (table,),
+            ).fetchone():
+                continue
+
+            cursor = legacy.execute(f"SELECT * FROM {table}")
+            columns = ", ".join(desc[0] for desc in cursor.description)
+            placeholders = ", ".join("?" * len(cursor.description))
+            conn.executemany(
+                f"INSERT INTO {table} ({columns}) VALUES ({placeholders})", cursor
+            )
+        finally:
+            legacy.close()
+
+        count = conn.execute(f"SELECT count(*) FROM {table}").fetchone()[0]
+        log.info(
+            f"Imported {count} rows into '{table}' from {legacy_path}, the old file is no longer used"
+        )
+
+
+def create_audit_log(conn: sqlite3.Connection):
+    create_tables("audit_log")(conn)
+    # /admin audit filters by row, by user or only by time, newest first
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_audit_log_row ON audit_log (table_name, row_id, at)"
+    )
+    conn.execute(
+        "CREATE INDEX IF NOT EXISTS idx_audit_log_actor ON audit_log (actor, at)"
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_at ON audit_log (at)")
+
+
+# Full-text indexes over the searchable columns, fts table -> (content table, columns).
+# They only store the index, the text itself stays in the content table.
+SEARCH_INDEXES = {
+    "games_fts": ("games", ("name", "description")),
+    "contributors_fts": (
+        "contributors",
+        ("credit_name", "discord_username", "discord_display_name"),
+    ),
+    "asset_requests_fts": ("asset_requests", ("content", "context")),
+}
+
+
+def create_search_indexes(conn: sqlite3.Connection):
+    for fts, (table, columns) in SEARCH_INDEXES.items():
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"new.{column}" for column in columns)
+        old_values = ", ".join(f"old.{column}" for column in columns)
+
+        # prefix indexes keep autocomplete on partial words fast
+        conn.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{column_list}, content='{table}', content_rowid='id', "
+            f"tokenize='unicode61 remove_diacritics 2', prefix='2 3')"
+        )
+
+        # keep the index in sync with every write to the content table
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values}); END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); END"
+        )
+        conn.execute(
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {column_list} ON {table} BEGIN "
+            f"INSERT INTO {fts} ({fts}, rowid, {column_list}) VALUES ('delete', old.id, {old_values}); "
+            f"INSERT INTO {fts} (rowid, {column_list}) VALUES (new.id, {new_values}); END"
+        )
+
+        # index the rows that already exist
+        conn.execute(f"INSERT INTO {fts} ({fts}) VALUES ('rebuild')")
+
+
+# Ordered migrations per database file: (version, description, apply).
+# Never edit or reorder a released migration, append a new one instead.
+MIGRATIONS = {
+    Database.GAMES_DB: [
+        (
+            1,
+            "initial tables",
+            create_tables(
+                "games", "contributors", "game_contributors", "asset_requests"
+            ),
+        ),
+        (2, "contributor and game fields", add_new_fields),
+        (3, "lookup indexes", create_indexes),
+        (4, "tasks and events moved into games.db", import_tasks_and_events),
+        (5, "audit log", create_audit_log),
+        (6, "full-text search indexes", create_search_indexes),
+    ],
+}
+
+
+def migrate():
+    """
+    Bring every database file up to its latest version, tracked in PRAGMA user_version.
+    Each migration runs in its own transaction together with the version bump.
+    """
+    for db_path, migrations in MIGRATIONS.items():
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+
+        with Database.connect(db_path) as conn:
+            current = conn.execute("PRAGMA user_version").fetchone()[0]
+
+            for version, description, apply in migrations:
+                if version <= current:
+                    continue
+
+                log.info(f"Migrating {db_path} to version {version}: {description}")
+                conn.execute("BEGIN")
+                apply(conn)
+                conn.execute(f"PRAGMA user_version = {version}")
+                conn.commit()
+
+
+if __name__ == "__main__":
+    migrate()
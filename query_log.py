@@ -0,0 +1,229 @@
+import bisect
+import logging
+import logging.handlers
+import queue
+import random
+import re
+import sqlite3
+import sys
+import threading
+from functools import lru_cache
+
+LOG_FORMAT = "%(asctime)s %(levelname)-7s %(name)s: %(message)s"
+
+# upper bounds of the latency histogram buckets, in milliseconds
+LATENCY_BUCKETS_MS = (0.1, 0.5, 1, 5, 10, 50, 100, 500, 1000, 5000)
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+def start_logging(level: int = logging.INFO):
+    """
+    Send every log record through a queue to a background thread that writes it
+    to stdout, so logging never blocks the event loop or the database thread.
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    log_queue = queue.SimpleQueue()
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter(LOG_FORMAT))
+    _listener = logging.handlers.QueueListener(log_queue, stream)
+
+    root = logging.getLogger()
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    root.setLevel(level)
+    # py-cord is chatty at INFO, keep it at its previous warnings-only output
+    logging.getLogger("discord").setLevel(logging.WARNING)
+
+    _listener.start()
+
+
+def stop_logging():
+    """Write out whatever is still queued and stop the background thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(query: str) -> str:
+    """
+    Reduce a statement to its shape, so the same query with different
+    literals or IN list lengths is counted as one.
+    """
+    query = re.sub(r"'(?:[^']|'')*'", "?", query)
+    query = re.sub(r"\b\d+(?:\.\d+)?\b", "?", query)
+    query = re.sub(r"\(\s*\?(?:\s*,\s*\?)+\s*\)", "(?, ...)", query)
+    return " ".join(query.split())
+
+
+class LatencyStats:
+    """
+    Call count, total, max and a latency histogram, e.g. for one normalized statement.
+    `bounds` are the upper bounds of the histogram buckets in milliseconds, the
+    last bucket counts everything above them.
+    """
+
+    __slots__ = ("bounds", "count", "total", "max", "buckets")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS_MS):
+        self.bounds = bounds
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(bounds) + 1)
+
+    def add(self, elapsed_ms: float):
+        self.count += 1
+        self.total += elapsed_ms
+        self.max = max(self.max, elapsed_ms)
+        self.buckets[bisect.bisect_left(self.bounds, elapsed_ms)] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound of the bucket holding the given percentile, in milliseconds."""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.bounds, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+        return self.max
+
+
+class QueryLog:
+    """
+    Times every executed statement.
+    - Latencies go into per-statement histograms keyed by normalized SQL.
+    - Statements slower than `slow_threshold_ms` are logged to "db.slow_query".
+    - With echo on, `sample_rate` of the statements are logged to "db.query" at
+      DEBUG level. Echo is toggled through the logger level, so it can be
+      switched at runtime.
+    - With `explain` on (development), each distinct statement's query plan is
+      checked once and full scans of large tables are logged.
+    """
+
+    def __init__(
+        self,
+        echo: bool = False,
+        sample_rate: float = 1.0,
+        slow_threshold_ms: float = 100.0,
+        explain: bool = False,
+        large_table_rows: int = 1000,
+    ):
+        self.logger = logging.getLogger("db.query")
+        self.slow_logger = logging.getLogger("db.slow_query")
+        self.plan_logger = logging.getLogger("db.query_plan")
+        self.sample_rate = sample_rate
+        self.slow_threshold_ms = slow_threshold_ms
+        self.explain = explain
+        self.large_table_rows = large_table_rows
+        self.set_echo(echo)
+
+        self._stats: dict[str, LatencyStats] = {}
+        self._explained: set[str] = set()
+        self._lock = threading.Lock()
+
+    @property
+    def echo(self) -> bool:
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def set_echo(self, echo: bool, sample_rate: float | None = None):
+        self.logger.setLevel(logging.DEBUG if echo else logging.INFO)
+        if sample_rate is not None:
+            self.sample_rate = max(0.0, min(1.0, sample_rate))
+
+    def record(self, query: str, params, elapsed: float, rows: int):
+        elapsed_ms = elapsed * 1000
+        statement = normalize_sql(query)
+
+        with self._lock:
+            stats = self._stats.get(statement)
+            if stats is None:
+                stats = self._stats[statement] = LatencyStats()
+            stats.add(elapsed_ms)
+
+        extra = {"query": statement, "elapsed_ms": elapsed_ms, "rows": rows}
+        if elapsed_ms >= self.slow_threshold_ms:
+            self.slow_logger.warning(
+                "%.2f ms, %d rows: %s params=%r",
+                elapsed_ms,
+                rows,
+                statement,
+                params,
+                extra=extra,
+            )
+        elif self.echo and random.random() < self.sample_rate:
+            self.logger.debug(
+                "%.2f ms, %d rows: %s params=%r",
+                elapsed_ms,
+                rows,
+                statement,
+                params,
+                extra=extra,
+            )
+
+    def top(self, n: int = 10, by: str = "total") -> list[tuple[str, LatencyStats]]:
+        """The `n` statements with the highest total, max or p95 latency."""
+        keys = {
+            "total": lambda item: item[1].total,
+            "max": lambda item: item[1].max,
+            "p95": lambda item: item[1].percentile(0.95),
+        }
+        with self._lock:
+            items = list(self._stats.items())
+        return sorted(items, key=keys[by], reverse=True)[:n]
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+            self._explained.clear()
+
+    def check_plan(self, conn: sqlite3.Connection, query: str, params):
+        """Log full scans of large tables in the query plan, once per distinct statement."""
+        statement = normalize_sql(query)
+        with self._lock:
+            if statement in self._explained:
+                return
+            self._explained.add(statement)
+
+        if not statement.upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            return
+
+        try:
+            plan = conn.execute(f"EXPLAIN QUERY PLAN {query}", params).fetchall()
+        except sqlite3.Error as e:
+            self.plan_logger.warning(f"Could not explain {statement}: {e}")
+            return
+
+        aliases = _table_aliases(query)
+        for *_, detail in plan:
+            match = re.match(r"SCAN (?:TABLE )?(\w+)", detail)
+            if match is None:
+                continue
+
+            table = aliases.get(match.group(1), match.group(1))
+            try:
+                (size,) = conn.execute(f"SELECT count(*) FROM {table}").fetchone()
+            except sqlite3.Error:
+                continue  # a subquery or CTE, not a real table
+
+            if size >= self.large_table_rows:
+                self.plan_logger.warning(
+                    f"Full scan of `{table}` ({size} rows): {detail}\n    {statement}"
+                )
+
+
+def _table_aliases(query: str) -> dict[str, str]:
+    """Map the aliases in FROM and JOIN clauses to their table names."""
+    aliases = {}
+    for table, alias in re.findall(
+        r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(?!(?:WHERE|JOIN|ON|LEFT|INNER|CROSS|ORDER|GROUP|LIMIT|USING)\b)(\w+))?",
+        query,
+        re.IGNORECASE,
+    ):
+        if alias:
+            aliases[alias] = table
+    return aliases
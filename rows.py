@@ -0,0 +1,127 @@
+from dataclasses import dataclass, make_dataclass
+from functools import lru_cache
+from operator import itemgetter
+
+
+class Row:
+    """
+    Read-only mapping access for the typed rows, so existing code using
+    row["owner"], row.get("owner") or dict(row) keeps working.
+    """
+
+    __slots__ = ()
+
+    def __getitem__(self, key: str):
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.__match_args__
+
+    def __iter__(self):
+        return iter(self.__match_args__)
+
+    def __len__(self) -> int:
+        return len(self.__match_args__)
+
+    def get(self, key: str, default=None):
+        return getattr(self, key, default)
+
+    def keys(self) -> tuple[str, ...]:
+        # dataclasses list their fields in __match_args__
+        return self.__match_args__
+
+    def values(self) -> list:
+        return [getattr(self, key) for key in self.__match_args__]
+
+    def items(self) -> list[tuple]:
+        return [(key, getattr(self, key)) for key in self.__match_args__]
+
+
+@dataclass(slots=True)
+class GameRow(Row):
+    id: int
+    name: str
+    repo_name: str
+    channel_id: int
+    owner: str
+    owner_display_name: str
+    itch_io_link: str | None
+    gdd_link: str | None
+    state: int
+    description: str | None
+
+
+@dataclass(slots=True)
+class ContributorRow(Row):
+    id: int
+    discord_username: str
+    discord_display_name: str | None
+    credit_name: str
+    itch_io_link: str | None
+    alt_link: str | None
+    time_zone: int | None
+    trust_points: int
+    trust_remarks: str | None
+
+
+@dataclass(slots=True)
+class GameContributorRow(Row):
+    game_id: int
+    contributor_id: int
+    role: str
+
+
+@dataclass(slots=True)
+class AssetRequestRow(Row):
+    id: int
+    game_id: int
+    asset_type: str
+    content: str
+    context: str | None
+    requested_by: str
+    accepted_by: str | None
+    status: str
+
+
+ROW_TYPES = {
+    frozenset(row_type.__match_args__): row_type
+    for row_type in (GameRow, ContributorRow, GameContributorRow, AssetRequestRow)
+}
+
+
+@lru_cache(maxsize=256)
+def projection_type(col_names: tuple[str, ...]) -> type[Row] | None:
+    """
+    A row type with exactly these fields, for projections and joins.
+    None when the names can't be fields, e.g. count(*) or a name used twice.
+    """
+    try:
+        return make_dataclass("ProjectedRow", col_names, bases=(Row,), slots=True)
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=256)
+def row_factory(col_names: tuple[str, ...]):
+    """
+    Build a converter from raw sqlite tuples with these columns to row objects.
+    Full rows of the known tables become their typed rows, projections and
+    joins a row type made for their columns. Columns that can't be fields fall
+    back to a plain dict.
+    """
+    row_type = ROW_TYPES.get(frozenset(col_names))
+    if row_type is None or len(col_names) != len(row_type.__match_args__):
+        row_type = projection_type(col_names)
+        if row_type is None:
+            return lambda row: dict(zip(col_names, row))
+        return lambda row: row_type(*row)
+
+    if col_names == row_type.__match_args__:
+        return lambda row: row_type(*row)
+
+    # same columns in a different order, e.g. added by ALTER TABLE on an old database
+    reorder = itemgetter(*(col_names.index(name) for name in row_type.__match_args__))
+    return lambda row: row_type(*reorder(row))
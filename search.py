@@ -0,0 +1,65 @@
+import discord
+from discord.ext import commands
+
+from databases import Database
+
+KIND_CHOICES = {
+    "Games": ["game"],
+    "Contributors": ["contributor"],
+    "Asset requests": ["asset request"],
+}
+
+KIND_ICONS = {
+    "game": "🎮",
+    "contributor": "🧑‍💻",
+    "asset request": "🎨",
+}
+
+
+async def search_autocomplete(ctx: discord.AutocompleteContext) -> list[str]:
+    if len(ctx.value.strip()) < 2:
+        return []
+
+    results = await Database.asearch(
+        ctx.value, KIND_CHOICES.get(ctx.options.get("kind")), limit=10
+    )
+    # Discord caps choices at 100 characters, duplicates are dropped in rank order
+    return list(
+        dict.fromkeys(result["title"][:100] for result in results if result["title"])
+    )
+
+
+class Search(commands.Cog):
+    def __init__(self, bot: discord.Bot):
+        self.bot = bot
+
+    @discord.slash_command(description="Search games, contributors and asset requests")
+    async def search(
+        self,
+        ctx: discord.ApplicationContext,
+        query: discord.Option(
+            str, "Words to look for", autocomplete=search_autocomplete
+        ),
+        kind: discord.Option(
+            str,
+            "Only search one kind of entry",
+            choices=list(KIND_CHOICES),
+            default=None,
+        ),
+    ):
+        results = await Database.asearch(query, KIND_CHOICES.get(kind), limit=10)
+        if not results:
+            await ctx.respond(f"No results for **{query}**.", ephemeral=True)
+            return
+
+        embed = discord.Embed(
+            title=f"Search results for {query}"[:256], color=discord.Color.blue()
+        )
+        for result in results:
+            embed.add_field(
+                name=f"{KIND_ICONS[result['kind']]} {result['title'] or '?'}"[:256],
+                value=(result["snippet"] or "-")[:1024],
+                inline=False,
+            )
+
+        await ctx.respond(embed=embed, ephemeral=True)
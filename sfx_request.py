@@ -1,13 +1,7 @@
-import os
-
 import discord
 from discord.ext import commands
 
-from utils import Utils
-
-Utils.ensure_env_var("SFX_REQUEST_CHANNEL_ID", 1461288656169074751)  # Test Server
-
-SFX_REQUEST_CHANNEL = int(os.getenv("SFX_REQUEST_CHANNEL_ID", 0))
+import config
 
 
 class SFXRequests(commands.Cog):
@@ -30,7 +24,7 @@ class SFXRequests(commands.Cog):
             bool, "Should there be variations of the sound effect?", default=False
         ),
     ):
-        if ctx.channel.id == SFX_REQUEST_CHANNEL:
+        if ctx.channel.id == config.get_int("SFX_REQUEST_CHANNEL_ID"):
             await ctx.defer(ephemeral=True)
             await ctx.channel.send(
                 f"**Filename**: {filename} , **Description**: {description}\n"
@@ -2,12 +2,12 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 
+from databases import Database
+
 intents = discord.Intents.default()
 intents.message_content = True
 bot = commands.Bot(command_prefix="!", intents=intents)
 
-# DB_NAME = "tasks.db"
-
 
 # --- Modals ---
 class AssignTaskModal(discord.ui.Modal, title="Assign Task"):
@@ -30,18 +30,12 @@ class AssignTaskModal(discord.ui.Modal, title="Assign Task"):
         self.add_item(self.deadline_input)
 
     async def on_submit(self, interaction: discord.Interaction):
+        Database.set_actor(interaction.user)
         user_id = self.user_id_input.value.strip("<@!>")
         description = self.description_input.value
         deadline = self.deadline_input.value if self.deadline_input.value else None
 
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute(
-            "INSERT INTO tasks (user_id, description, deadline) VALUES (?, ?, ?)",
-            (user_id, description, deadline),
-        )
-        conn.commit()
-        conn.close()
+        await Database.aadd_task(user_id, description, deadline)
         await interaction.response.send_message(
             f"Task assigned to <@{user_id}>!", ephemeral=True
         )
@@ -57,11 +51,8 @@ class TaskButtons(discord.ui.View):
     async def mark_finished(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ):
-        conn = sqlite3.connect(DB_NAME)
-        cursor = conn.cursor()
-        cursor.execute("UPDATE tasks SET finished=1 WHERE id=?", (self.task_id,))
-        conn.commit()
-        conn.close()
+        Database.set_actor(interaction.user)
+        await Database.amark_task_finished(self.task_id)
         await interaction.response.edit_message(
             content="Task marked as finished ✅", view=None
         )
@@ -84,19 +75,7 @@ async def assigntask(interaction: discord.Interaction):
 @bot.tree.command(name="showtasks", description="Show your tasks")
 async def showtasks(interaction: discord.Interaction):
     user_id = str(interaction.user.id)
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute(
-        """
-        SELECT id, description, deadline, finished FROM tasks 
-        WHERE user_id=? AND (event_id IS NULL OR event_id IN 
-            (SELECT id FROM events WHERE triggered=1))
-        ORDER BY deadline ASC
-    """,
-        (user_id,),
-    )
-    rows = cursor.fetchall()
-    conn.close()
+    rows = await Database.aget_tasks_for_user(user_id)
 
     if not rows:
         await interaction.response.send_message(
@@ -120,12 +99,8 @@ async def showtasks(interaction: discord.Interaction):
 @bot.tree.command(name="create_event", description="Create an event")
 @app_commands.describe(name="Name of the event")
 async def create_event(interaction: discord.Interaction, name: str):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO events (name) VALUES (?)", (name,))
-    event_id = cursor.lastrowid
-    conn.commit()
-    conn.close()
+    Database.set_actor(interaction.user)
+    event_id = await Database.aadd_event(name)
     await interaction.response.send_message(
         f'Event "{name}" created as #{event_id}', ephemeral=True
     )
@@ -136,15 +111,9 @@ async def create_event(interaction: discord.Interaction, name: str):
 async def create_event_task(
     interaction: discord.Interaction, event_id: int, description: str
 ):
+    Database.set_actor(interaction.user)
     user_id = str(interaction.user.id)
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute(
-        "INSERT INTO tasks (user_id, description, event_id) VALUES (?, ?, ?)",
-        (user_id, description, event_id),
-    )
-    conn.commit()
-    conn.close()
+    await Database.aadd_task(user_id, description, event_id=event_id)
     await interaction.response.send_message(
         f"Task for event #{event_id} created.", ephemeral=True
     )
@@ -153,11 +122,8 @@ async def create_event_task(
 @bot.tree.command(name="trigger_event", description="Trigger an event")
 @app_commands.describe(event_id="Event ID")
 async def trigger_event(interaction: discord.Interaction, event_id: int):
-    conn = sqlite3.connect(DB_NAME)
-    cursor = conn.cursor()
-    cursor.execute("UPDATE events SET triggered=1 WHERE id=?", (event_id,))
-    conn.commit()
-    conn.close()
+    Database.set_actor(interaction.user)
+    await Database.atrigger_event(event_id)
     await interaction.response.send_message(
         f"Event #{event_id} triggered!", ephemeral=True
     )
@@ -0,0 +1,25 @@
+import os
+import sys
+
+import pytest
+
+# the bot's modules live at the top of the repository
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from databases import Database  # noqa: E402
+from migrations import migrate  # noqa: E402
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    """A migrated, empty set of databases in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    migrate()
+    yield Database
+
+    with Database._pool_lock:
+        for conn in Database._connections.values():
+            conn.close()
+        Database._connections.clear()
+    Database.games.clear()
+    Database.contributors.clear()
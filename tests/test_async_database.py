@@ -0,0 +1,41 @@
+import asyncio
+import time
+
+SLOW_QUERY = """
+    WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 3000000)
+    SELECT count(*) FROM n
+"""
+
+
+def slow_query(db):
+    with db.connect(db.GAMES_DB) as conn:
+        rows, _ = db._query(conn, SLOW_QUERY)
+    return rows[0][0]
+
+
+def test_event_loop_stays_responsive_during_slow_query(db):
+    async def main():
+        loop = asyncio.get_running_loop()
+        query = asyncio.ensure_future(db.arun(slow_query, db))
+
+        # tick every 10 ms and keep the longest gap while the query runs
+        max_gap = 0.0
+        ticks = 0
+        last = loop.time()
+        while not query.done():
+            await asyncio.sleep(0.01)
+            now = loop.time()
+            max_gap = max(max_gap, now - last)
+            last = now
+            ticks += 1
+        return await query, max_gap, ticks
+
+    start = time.perf_counter()
+    count, max_gap, ticks = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+
+    assert count == 3000000
+    # the query has to be slow enough to matter for the test to mean anything
+    assert elapsed > 0.2
+    assert ticks > 10
+    assert max_gap < 0.1
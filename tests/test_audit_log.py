@@ -0,0 +1,17 @@
+import pytest
+
+
+def test_row_id_needs_a_table(db):
+    with pytest.raises(ValueError, match="needs a table"):
+        db.get_audit_log(row_id=1)
+
+
+def test_row_id_only_matches_its_table(db):
+    # both tables start their ids at 1
+    db.insert_into_db(db.GAMES_DB, "games", name="Game", repo_name="", channel_id=1)
+    db.register_contributor("someone", "Someone")
+
+    entries = db.get_audit_log(table="games", row_id=1)
+    assert [(entry["table_name"], entry["row_id"]) for entry in entries] == [
+        ("games", 1)
+    ]
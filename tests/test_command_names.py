@@ -0,0 +1,57 @@
+import asyncio
+import time
+import types
+
+import discord
+import pytest
+
+from discord_bot import bot
+from loop_monitor import LoopWatchdog
+from metrics import metrics
+
+
+@pytest.fixture
+def game_build():
+    """A /game build subcommand that blocks the event loop for a moment."""
+    group = discord.SlashCommandGroup("game", "Game commands")
+
+    @group.command(description="Build the game")
+    async def build(ctx):
+        time.sleep(0.2)
+
+    yield group
+    metrics.commands.clear()
+
+
+def invoke(group: discord.SlashCommandGroup, subcommand: str):
+    """Invoke `subcommand` of `group` the way py-cord does for an interaction."""
+    interaction = types.SimpleNamespace(
+        data={
+            "name": group.name,
+            "type": 1,
+            "options": [{"name": subcommand, "type": 1, "options": []}],
+        },
+        user=types.SimpleNamespace(name="someone"),
+        _state=None,
+    )
+    ctx = discord.ApplicationContext(bot, interaction)
+    ctx.command = group
+    return bot.invoke_application_command(ctx)
+
+
+def test_blocks_are_reported_under_the_subcommand(game_build):
+    watchdog = LoopWatchdog(threshold=0.05, interval=0.01)
+
+    async def run():
+        watchdog.start()
+        try:
+            await invoke(game_build, "build")
+            # let the watchdog see the heartbeat come back
+            await asyncio.sleep(0.1)
+        finally:
+            watchdog.stop()
+
+    asyncio.run(run())
+
+    assert [command for command, _ in watchdog.blockers] == ["game build"]
+    assert list(metrics.commands) == ["game build"]
@@ -0,0 +1,36 @@
+import pytest
+
+from data_transfer import export_table, import_table
+
+
+def games(db):
+    with db.connect(db.GAMES_DB) as conn:
+        return conn.execute(
+            "SELECT id, name, repo_name, channel_id, description FROM games ORDER BY id"
+        ).fetchall()
+
+
+@pytest.mark.parametrize("file_name", ["games.csv", "games.csv.gz", "games.jsonl"])
+def test_round_trip_keeps_empty_strings_and_nulls(db, tmp_path, file_name):
+    # games made without a repo store an empty repo_name, never NULL
+    db.insert_into_db(db.GAMES_DB, "games", name="No repo", repo_name="", channel_id=1)
+    db.insert_into_db(
+        db.GAMES_DB,
+        "games",
+        name="With repo",
+        repo_name="WithRepo",
+        channel_id=2,
+        description='a, "quoted"\nline',
+    )
+    before = games(db)
+
+    path = str(tmp_path / file_name)
+    assert export_table("games", path)[0] == 2
+    with db.connect(db.GAMES_DB) as conn:
+        conn.execute("DELETE FROM games")
+        conn.commit()
+    assert import_table("games", path)[0] == 2
+
+    assert games(db) == before
+    assert games(db)[0][2] == ""
+    assert games(db)[0][4] is None
@@ -0,0 +1,33 @@
+from db_cache import GameCache
+from metrics import Metrics
+
+
+def test_stats_are_served_as_counters_and_gauges():
+    cache = GameCache()
+    cache.get_by_id(1)
+    cache.load([{"id": 1, "channel_id": 10}])
+    cache.get_by_id(1)
+
+    metrics = Metrics()
+    metrics.add_stats(
+        "game_cache", "Games cache", cache.stats, counters=("hits", "misses")
+    )
+    lines = metrics.render().splitlines()
+
+    assert "# TYPE bot_game_cache_hits_total counter" in lines
+    assert "bot_game_cache_hits_total 1" in lines
+    assert "bot_game_cache_misses_total 1" in lines
+    assert "# TYPE bot_game_cache_size gauge" in lines
+    assert "bot_game_cache_size 1" in lines
+    assert "bot_game_cache_warm 1" in lines
+
+
+def test_the_bot_serves_its_cache_stats():
+    from discord_bot import metrics
+
+    rendered = metrics.render()
+    assert "bot_game_cache_hits_total" in rendered
+    assert "bot_contributor_cache_negative_hits_total" in rendered
+    assert "bot_contributor_cache_evictions_total" in rendered
+    assert "bot_db_log_dropped_total" in rendered
+    assert "bot_db_log_queue_depth" in rendered
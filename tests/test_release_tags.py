@@ -0,0 +1,34 @@
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+from github_wrapper import ReleaseTags
+
+
+class SlowRepo:
+    """A repository without tags whose tag lookup takes as long as a GitHub call."""
+
+    def __init__(self, full_name: str):
+        self.full_name = full_name
+
+    def get_git_matching_refs(self, ref: str):
+        time.sleep(0.2)
+        return [types.SimpleNamespace(ref="refs/tags/unrelated")]
+
+
+def test_concurrent_reservations_of_one_repo_are_unique():
+    tags = ReleaseTags()
+    repo = SlowRepo("org/game")
+    with ThreadPoolExecutor(5) as pool:
+        reserved = list(pool.map(lambda _: tags.reserve(repo), range(5)))
+    assert len(set(reserved)) == 5
+
+
+def test_repos_dont_wait_for_each_others_lookups():
+    tags = ReleaseTags()
+    repos = [SlowRepo(f"org/game-{i}") for i in range(4)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(4) as pool:
+        list(pool.map(tags.reserve, repos))
+    # one lookup's time, not four
+    assert time.perf_counter() - start < 0.6
@@ -0,0 +1,24 @@
+from rows import ContributorRow, row_factory
+
+
+def test_full_rows_become_their_table_row():
+    row = row_factory(ContributorRow.__match_args__)(
+        (1, "someone", None, "Someone", None, None, None, 3, None)
+    )
+    assert isinstance(row, ContributorRow)
+    assert row.trust_points == row["trust_points"] == 3
+
+
+def test_projections_have_attributes_and_mapping_access(db):
+    db.register_contributor("someone", "Someone")
+    db.update_fields(db.GAMES_DB, "contributors", 1, trust_points=2)
+
+    [row] = db.iter_rows(
+        db.GAMES_DB, "contributors", columns=("discord_username", "trust_points")
+    )
+    assert (row.id, row.discord_username, row.trust_points) == (1, "someone", 2)
+    assert dict(row) == {"id": 1, "discord_username": "someone", "trust_points": 2}
+
+
+def test_columns_that_cant_be_fields_stay_dicts():
+    assert row_factory(("count(*)",))((3,)) == {"count(*)": 3}
@@ -0,0 +1,45 @@
+import os
+import time
+
+import pytest
+
+import backups
+import maintenance
+from backups import BackupJob
+from maintenance import MaintenanceJob
+
+
+def touch(path, age: float):
+    with open(path, "wb"):
+        pass
+    at = time.time() - age
+    os.utime(path, (at, at))
+
+
+def test_backup_runs_soon_after_startup_without_snapshots(tmp_path):
+    job = BackupJob(interval=6 * 60 * 60, backup_dir=str(tmp_path / "backups"))
+    assert job.first_delay() == backups.STARTUP_DELAY
+
+
+def test_backup_is_due_an_interval_after_the_newest_snapshot(tmp_path):
+    job = BackupJob(interval=6 * 60 * 60, backup_dir=str(tmp_path))
+    touch(tmp_path / "games-20260101-000000.db.gz", age=5 * 60 * 60)
+    touch(tmp_path / "games-20260101-060000.db.gz", age=2 * 60 * 60)
+    assert job.first_delay() == pytest.approx(4 * 60 * 60, abs=5)
+
+
+def test_overdue_backup_runs_soon_after_startup(tmp_path):
+    job = BackupJob(interval=6 * 60 * 60, backup_dir=str(tmp_path))
+    touch(tmp_path / "games-20260101-000000.db.gz", age=7 * 60 * 60)
+    assert job.first_delay() == backups.STARTUP_DELAY
+
+
+def test_maintenance_keeps_its_schedule_over_restarts(db, tmp_path):
+    last_run_path = str(tmp_path / "maintenance.last")
+    job = MaintenanceJob(interval=24 * 60 * 60, last_run_path=last_run_path)
+    assert job.first_delay() == maintenance.STARTUP_DELAY
+
+    job.run()
+    # as seen by the next process
+    restarted = MaintenanceJob(interval=24 * 60 * 60, last_run_path=last_run_path)
+    assert restarted.first_delay() == pytest.approx(24 * 60 * 60, abs=5)
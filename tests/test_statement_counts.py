@@ -0,0 +1,55 @@
+import pytest
+
+
+@pytest.fixture
+def statements(db):
+    """The SQL statements run on the games database while the test runs."""
+    with db.connect(db.GAMES_DB) as conn:
+        seen = []
+        conn.set_trace_callback(seen.append)
+    yield seen
+    with db.connect(db.GAMES_DB) as conn:
+        conn.set_trace_callback(None)
+
+
+@pytest.fixture
+def game(db):
+    game = db.insert_into_db(
+        db.GAMES_DB, "games", name="Game", repo_name="Game", channel_id=1, owner="owner"
+    )
+    for i in range(5):
+        contributor = db.insert_into_db(
+            db.GAMES_DB,
+            "contributors",
+            discord_username=f"user{i}",
+            credit_name=f"User {i}",
+        )
+        db.insert_into_db(
+            db.GAMES_DB,
+            "game_contributors",
+            game_id=game["id"],
+            contributor_id=contributor["id"],
+            role="Project Lead" if i % 2 else "QA",
+        )
+        db.insert_into_db(
+            db.GAMES_DB,
+            "asset_requests",
+            game_id=game["id"],
+            asset_type="SFX",
+            content=f"sound {i}",
+            requested_by=contributor["id"],
+            status="Pending",
+        )
+    return game
+
+
+def test_game_leads_is_one_statement(db, game, statements):
+    assert db.get_game_leads(game["id"]) == ["owner", "user1", "user3"]
+    assert len(statements) == 1
+
+
+def test_asset_requests_with_games_is_one_statement(db, game, statements):
+    pairs = db.get_asset_requests_with_games("SFX")
+    assert len(pairs) == 5
+    assert all(game_row["name"] == "Game" for _, game_row in pairs)
+    assert len(statements) == 1
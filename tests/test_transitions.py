@@ -0,0 +1,59 @@
+import threading
+
+
+def race(*calls):
+    """Run the calls on their own threads, released at the same moment."""
+    barrier = threading.Barrier(len(calls))
+    results = [None] * len(calls)
+
+    def run(i, call):
+        barrier.wait()
+        results[i] = call()
+
+    threads = [
+        threading.Thread(target=run, args=(i, call)) for i, call in enumerate(calls)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def transitions(db, request_id):
+    return [
+        entry
+        for entry in db.get_audit_log(table="asset_requests", row_id=request_id)
+        if entry["action"] == "transition"
+    ]
+
+
+def test_only_one_of_two_finish_clicks_wins(db):
+    db.add_asset_request(1, "2D", "A tree", None, "someone")
+    assert db.mark_request_accepted(1, "artist")
+
+    results = race(
+        lambda: db.mark_request_finished(1), lambda: db.mark_request_finished(1)
+    )
+
+    assert sorted(results) == [False, True]
+    assert len(transitions(db, 1)) == 2  # accepted, then finished once
+    assert (
+        db.fetch_one_as_dict(db.GAMES_DB, "asset_requests", "id = ?", (1,)).status
+        == "Finished"
+    )
+
+
+def test_only_one_of_two_accepts_wins(db):
+    db.add_asset_request(1, "2D", "A tree", None, "someone")
+
+    results = race(
+        lambda: db.mark_request_accepted(1, "first"),
+        lambda: db.mark_request_accepted(1, "second"),
+    )
+
+    assert sorted(results) == [False, True]
+    [entry] = transitions(db, 1)
+    row = db.fetch_one_as_dict(db.GAMES_DB, "asset_requests", "id = ?", (1,))
+    assert row.accepted_by == ("first" if results[0] else "second")
+    assert str(row.accepted_by) in entry["changes"]
@@ -1,4 +1,3 @@
-import os
 from datetime import datetime, timedelta, timezone
 
 import discord
@@ -7,7 +6,9 @@ import discord
 class Utils:
     @staticmethod
     def is_test_environment() -> bool:
-        return os.getenv("IS_TEST", "false").lower() == "true"
+        import config  # config itself imports Utils
+
+        return config.get("IS_TEST", "false").lower() == "true"
 
     @staticmethod
     async def send_guide_link(channel, user):